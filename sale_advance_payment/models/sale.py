@@ -1,6 +1,8 @@
 # Copyright 2017 Omar Castiñeira, Comunitea Servicios Tecnológicos S.L.
 # License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl).
 
+from collections import defaultdict
+
 from odoo import api, fields, models
 from odoo.tools import float_compare
 
@@ -53,32 +55,11 @@ class SaleOrder(models.Model):
         "invoice_ids.amount_residual",
     )
     def _compute_advance_payment(self):
+        payment_lines = self._get_advance_payment_lines()
+        advance_amounts = self._get_advance_amounts(payment_lines)
         for order in self:
-            mls = order.account_payment_ids.mapped("move_id.line_ids").filtered(
-                lambda x: x.account_id.account_type == "asset_receivable"
-                and x.parent_state == "posted"
-            )
-            advance_amount = 0.0
-            for line in mls:
-                line_currency = line.currency_id or line.company_id.currency_id
-                # Exclude reconciled pre-payments amount because once reconciled
-                # the pre-payment will reduce invoice residual amount like any
-                # other payment.
-                line_amount = (
-                    line.amount_residual_currency
-                    if line.currency_id
-                    else line.amount_residual
-                )
-                line_amount *= -1
-                if line_currency != order.currency_id:
-                    advance_amount += line.currency_id._convert(
-                        line_amount,
-                        order.currency_id,
-                        order.company_id,
-                        line.date or fields.Date.today(),
-                    )
-                else:
-                    advance_amount += line_amount
+            mls = payment_lines[order]
+            advance_amount = advance_amounts[order]
             # Consider payments in related invoices.
             invoice_paid_amount = 0.0
             for inv in order.invoice_ids:
@@ -96,3 +77,68 @@ class SaleOrder(models.Model):
             order.payment_line_ids = mls
             order.amount_residual = amount_residual
             order.advance_payment_status = payment_state
+
+    def _get_advance_payment_lines(self):
+        """Get the posted receivable lines of the advance payments of the
+        orders, with a single search for the orders in database.
+
+        :return: dict {sale.order: account.move.line}
+        """
+        MoveLine = self.env["account.move.line"]
+        lines_by_order = defaultdict(list)
+        orders = self.filtered("id")
+        if orders:
+            lines = MoveLine.sudo().search(
+                [
+                    ("payment_id.sale_id", "in", orders.ids),
+                    ("account_id.account_type", "=", "asset_receivable"),
+                    ("parent_state", "=", "posted"),
+                ]
+            )
+            for line in lines.with_env(self.env):
+                lines_by_order[line.payment_id.sale_id.id].append(line)
+        res = {}
+        for order in self:
+            if order in orders:
+                res[order] = MoveLine.concat(*lines_by_order[order.id])
+            else:
+                res[order] = order.account_payment_ids.mapped(
+                    "move_id.line_ids"
+                ).filtered(
+                    lambda x: x.account_id.account_type == "asset_receivable"
+                    and x.parent_state == "posted"
+                )
+        return res
+
+    def _get_advance_amounts(self, payment_lines):
+        """Sum the residual amounts of the advance payment lines per order,
+        line currency and date, and convert each sum once in the order
+        currency.
+
+        :param payment_lines: dict {sale.order: account.move.line}
+        :return: dict {sale.order: advance amount}
+        """
+        today = fields.Date.today()
+        buckets = defaultdict(float)
+        for order in self:
+            for line in payment_lines[order]:
+                line_currency = line.currency_id or line.company_id.currency_id
+                # Exclude reconciled pre-payments amount because once reconciled
+                # the pre-payment will reduce invoice residual amount like any
+                # other payment.
+                line_amount = (
+                    line.amount_residual_currency
+                    if line.currency_id
+                    else line.amount_residual
+                )
+                buckets[(order, line_currency, line.date or today)] -= line_amount
+        rates = {}
+        advance_amounts = dict.fromkeys(self, 0.0)
+        for (order, currency, date), amount in buckets.items():
+            if currency != order.currency_id:
+                key = (currency, order.currency_id, order.company_id, date)
+                if key not in rates:
+                    rates[key] = currency._get_conversion_rate(*key)
+                amount = order.currency_id.round(amount * rates[key])
+            advance_amounts[order] += amount
+        return advance_amounts
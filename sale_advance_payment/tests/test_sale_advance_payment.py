@@ -375,3 +375,38 @@ class TestSaleAdvancePayment(common.TransactionCase):
         self.assertEqual(invoice.amount_residual, 0.0)
         self.assertEqual(self.sale_order_1.amount_residual, 1600)
         self.assertEqual(invoice.amount_residual, 0)
+
+    def test_04_advance_payment_batch(self):
+        sale_order_2 = self.sale_order_1.copy()
+        orders = self.sale_order_1 | sale_order_2
+        for order, journal, amount in [
+            (self.sale_order_1, self.journal_eur_bank, 100),
+            (self.sale_order_1, self.journal_eur_bank, 150),
+            (sale_order_2, self.journal_usd_bank, 600),
+        ]:
+            wizard = (
+                self.env["account.voucher.wizard"]
+                .with_context(active_ids=order.ids, active_id=order.id)
+                .create(
+                    {
+                        "journal_id": journal.id,
+                        "payment_type": "inbound",
+                        "amount_advance": amount,
+                        "order_id": order.id,
+                    }
+                )
+            )
+            wizard.make_advance_payment()
+        self.assertEqual(self.sale_order_1.amount_residual, 3300)
+        self.assertEqual(sale_order_2.amount_residual, 3000)
+        self.assertEqual(orders.mapped("advance_payment_status"), ["partial"] * 2)
+        self.assertEqual(len(self.sale_order_1.payment_line_ids), 2)
+        self.assertEqual(len(sale_order_2.payment_line_ids), 1)
+        payment_lines = self.sale_order_1.payment_line_ids
+        # Cancelling a payment only unlinks its move line
+        self.sale_order_1.account_payment_ids[0].action_draft()
+        self.assertEqual(len(self.sale_order_1.payment_line_ids), 1)
+        self.assertTrue(self.sale_order_1.payment_line_ids < payment_lines)
+        self.assertEqual(
+            sale_order_2.payment_line_ids.payment_id, sale_order_2.account_payment_ids
+        )
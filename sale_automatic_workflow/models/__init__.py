@@ -2,5 +2,6 @@ from . import account_move
 from . import automatic_workflow_job
 from . import sale_order
 from . import sale_workflow_process
+from . import sale_workflow_run_log
 from . import stock_move
 from . import stock_picking
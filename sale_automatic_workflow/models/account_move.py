@@ -4,6 +4,7 @@
 # License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl).
 
 from odoo import fields, models
+from odoo.tools.sql import create_index
 
 
 class AccountMove(models.Model):
@@ -12,3 +13,9 @@ class AccountMove(models.Model):
     workflow_process_id = fields.Many2one(
         comodel_name="sale.workflow.process", string="Sale Workflow Process"
     )
+
+    def init(self):
+        # used by the incremental mode of the automatic workflows
+        create_index(
+            self._cr, "account_move_write_date_index", self._table, ["write_date"]
+        )
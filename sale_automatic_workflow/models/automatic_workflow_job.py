@@ -3,10 +3,15 @@
 # Copyright 2016 Sodexis
 # License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl).
 
+import json
 import logging
+import math
+import time
+from collections import defaultdict
 from contextlib import contextmanager
 
 from odoo import api, fields, models
+from odoo.tools import groupby
 from odoo.tools.safe_eval import safe_eval
 
 _logger = logging.getLogger(__name__)
@@ -25,6 +30,50 @@ def savepoint(cr):
         _logger.exception("Error during an automatic workflow action.")
 
 
+class WorkflowStepMetrics(object):
+    """Collect the metrics of a step of an automatic workflow run"""
+
+    def __init__(self, cr):
+        self.cr = cr
+        self.success_count = 0
+        self.failure_count = 0
+        self.bypassed_count = 0
+        self.latencies = []
+        self.start = time.perf_counter()
+        self.start_query_count = cr.sql_log_count
+        self.duration = 0.0
+        self.query_count = 0
+
+    def add_success(self, count, duration):
+        self.success_count += count
+        if count:
+            self.latencies += [duration / count] * count
+
+    def add_failure(self, count, duration):
+        self.failure_count += count
+        if count:
+            self.latencies += [duration / count] * count
+
+    def add_bypassed(self, count):
+        self.bypassed_count += count
+
+    def stop(self):
+        self.duration = time.perf_counter() - self.start
+        self.query_count = self.cr.sql_log_count - self.start_query_count
+
+    @property
+    def record_count(self):
+        return self.success_count + self.failure_count + self.bypassed_count
+
+    def percentile(self, percent):
+        """Nearest-rank percentile of the per-record latencies"""
+        if not self.latencies:
+            return 0.0
+        latencies = sorted(self.latencies)
+        rank = max(math.ceil(percent / 100.0 * len(latencies)), 1)
+        return latencies[rank - 1]
+
+
 class AutomaticWorkflowJob(models.Model):
     """Scheduler that will play automatically the validation of
     invoices, pickings..."""
@@ -35,11 +84,119 @@ class AutomaticWorkflowJob(models.Model):
         " invoices, pickings..."
     )
 
+    def _get_batch_size(self):
+        """Return the size of the batches, 0 when records are processed
+        one by one"""
+        return self.env.context.get("auto_workflow_batch_size") or 0
+
+    def _split_batches(self, records):
+        """Split records in batches of records of the same company"""
+        batch_size = self._get_batch_size()
+        for company, company_records in groupby(records, key=lambda r: r.company_id):
+            company_records = records.browse().concat(*company_records)
+            for index in range(0, len(company_records), batch_size):
+                yield company_records[index : index + batch_size].with_company(company)
+
+    def _add_bypassed_metrics(self, count=1):
+        """Record records skipped because they no longer match the filter of
+        the step in the metrics of the current step, if any"""
+        metrics = self.env.context.get("auto_workflow_metrics")
+        if metrics:
+            metrics.add_bypassed(count)
+
+    @contextmanager
+    def _track_metrics(self, count=1):
+        """Record the processing of records in the metrics of the current
+        step, if any
+
+        The records bypassed meanwhile are not counted as successes.
+        """
+        metrics = self.env.context.get("auto_workflow_metrics")
+        start = time.perf_counter()
+        bypassed_count = metrics.bypassed_count if metrics else 0
+        try:
+            yield
+        except Exception:
+            if metrics:
+                metrics.bypassed_count = bypassed_count
+                metrics.add_failure(count, time.perf_counter() - start)
+            raise
+        if metrics:
+            count -= metrics.bypassed_count - bypassed_count
+            metrics.add_success(count, time.perf_counter() - start)
+
+    @contextmanager
+    def _collect_metrics(self, sale_workflow, step):
+        """Collect the metrics of a step of a workflow, then log them
+
+        Yield the job environment to use to run the step.
+        """
+        metrics = WorkflowStepMetrics(self.env.cr)
+        yield self.with_context(auto_workflow_metrics=metrics)
+        metrics.stop()
+        if not metrics.record_count:
+            return
+        values = {
+            "workflow_process_id": sale_workflow.id,
+            "step": step,
+            "record_count": metrics.record_count,
+            "success_count": metrics.success_count,
+            "failure_count": metrics.failure_count,
+            "bypassed_count": metrics.bypassed_count,
+            "duration": metrics.duration,
+            "query_count": metrics.query_count,
+            "latency_p50": metrics.percentile(50),
+            "latency_p95": metrics.percentile(95),
+        }
+        _logger.info("Automatic workflow metrics: %s", json.dumps(values))
+        self.env["sale.workflow.run.log"].sudo().create(values)
+
+    def _filter_batch(self, records, domain_filter):
+        """Return the records of the batch still matching the domain"""
+        filtered_records = records.search([("id", "in", records.ids)] + domain_filter)
+        self._add_bypassed_metrics(len(records) - len(filtered_records))
+        return filtered_records
+
+    def _do_batch(self, method_name, records, domain_filter):
+        """Call a ``_do_*_batch`` method on records inside a savepoint
+
+        When the batch fails, it is split in two halves which are processed
+        separately, until the failing records are isolated. The records
+        processed successfully are kept.
+        """
+        metrics = self.env.context.get("auto_workflow_metrics")
+        start = time.perf_counter()
+        bypassed_count = metrics.bypassed_count if metrics else 0
+        try:
+            with self.env.cr.savepoint():
+                res = getattr(self, method_name)(records, domain_filter)
+            if metrics:
+                count = len(records) - (metrics.bypassed_count - bypassed_count)
+                metrics.add_success(count, time.perf_counter() - start)
+            return res
+        except Exception:
+            if metrics:
+                # the records of the batch are processed again
+                metrics.bypassed_count = bypassed_count
+            if len(records) <= 1:
+                _logger.exception("Error during an automatic workflow action.")
+                if metrics:
+                    metrics.add_failure(1, time.perf_counter() - start)
+                return
+            half = len(records) // 2
+            self._do_batch(method_name, records[:half], domain_filter)
+            self._do_batch(method_name, records[half:], domain_filter)
+
+    def _run_batches(self, method_name, batches, domain_filter):
+        for batch in batches:
+            self._do_batch(method_name, batch, domain_filter)
+
     def _do_validate_sale_order(self, sale, domain_filter):
         """Validate a sales order, filter ensure no duplication"""
         if not self.env["sale.order"].search_count(
             [("id", "=", sale.id)] + domain_filter
         ):
+            self._add_bypassed_metrics()
             return "{} {} job bypassed".format(sale.display_name, sale)
         sale.action_confirm()
         return "{} {} confirmed successfully".format(sale.display_name, sale)
@@ -58,13 +215,70 @@ class AutomaticWorkflowJob(models.Model):
             sale.display_name, sale
         )
 
+    def _do_validate_sale_order_batch(self, sales, domain_filter):
+        """Validate a batch of sales orders, filter ensure no duplication"""
+        sales = self._filter_batch(sales, domain_filter)
+        if not sales:
+            return "{} job bypassed".format(sales)
+        sales.action_confirm()
+        if self.env.context.get("send_order_confirmation_mail"):
+            self._send_order_confirmation_mail_batch(sales)
+        return "{} confirmed successfully".format(sales)
+
+    def _post_mail_template(self, records, template):
+        """Post a mail template on records with a single composer
+
+        The template is rendered for all the records at once, and the mails
+        are queued for the mail queue cron instead of being sent inline. The
+        composer is run with the same context as the invoice sending wizard,
+        so the attached documents are not imported back on the invoices.
+        """
+        composer = (
+            records.env["mail.compose.message"]
+            .with_context(active_model=records._name, active_ids=records.ids)
+            .create(
+                {
+                    "composition_mode": "mass_post",
+                    "model": records._name,
+                    "template_id": template.id,
+                    "email_layout_xmlid": (
+                        "mail.mail_notification_layout_with_responsible_signature"
+                    ),
+                }
+            )
+        )
+        composer._onchange_template_id_wrapper()
+        composer.with_context(
+            mail_notify_force_send=False,
+            no_new_invoice=True,
+            mail_notify_author=self.env.user.partner_id in composer.partner_ids,
+        )._action_send_mail()
+
+    def _send_order_confirmation_mail_batch(self, sales):
+        """Send the confirmation mails of a batch of confirmed sales orders"""
+        for (user, template), group in groupby(
+            sales, key=lambda sale: (sale.user_id, sale._get_confirmation_template())
+        ):
+            if not template:
+                continue
+            group = sales.browse().concat(*group)
+            if user:
+                group = group.with_user(user)
+            self._post_mail_template(group, template)
+
     @api.model
     def _validate_sale_orders(self, order_filter):
         sale_obj = self.env["sale.order"]
         sales = sale_obj.search(order_filter)
         _logger.debug("Sale Orders to validate: %s", sales.ids)
+        if self._get_batch_size():
+            return self._run_batches(
+                "_do_validate_sale_order_batch",
+                self._split_batches(sales),
+                order_filter,
+            )
         for sale in sales:
-            with savepoint(self.env.cr):
+            with savepoint(self.env.cr), self._track_metrics():
                 self._do_validate_sale_order(
                     sale.with_company(sale.company_id), order_filter
                 )
@@ -76,6 +290,7 @@ class AutomaticWorkflowJob(models.Model):
         if not self.env["sale.order"].search_count(
             [("id", "=", sale.id)] + domain_filter
         ):
+            self._add_bypassed_metrics()
             return "{} {} job bypassed".format(sale.display_name, sale)
         payment = self.env["sale.advance.payment.inv"].create(
             {"sale_order_ids": sale.ids}
@@ -83,13 +298,67 @@ class AutomaticWorkflowJob(models.Model):
         payment.with_context(active_model="sale.order").create_invoices()
         return "{} {} create invoice successfully".format(sale.display_name, sale)
 
+    def _do_create_invoice_batch(self, sales, domain_filter):
+        """Create the invoices of a batch of sales orders, filter ensure no
+        duplication
+
+        One invoice is created per sales order, unless the invoices are
+        consolidated: then the batch is a group of sales orders sharing the
+        same invoicing key, and a single invoice is created for them.
+        """
+        sales = self._filter_batch(sales, domain_filter)
+        if not sales:
+            return "{} job bypassed".format(sales)
+        group_invoice = self.env.context.get("auto_workflow_group_invoice")
+        start = time.perf_counter()
+        # same options as the sale.advance.payment.inv wizard
+        sales._create_invoices(grouped=not group_invoice, final=True)
+        if group_invoice:
+            _logger.info(
+                "Invoice group %s: %s sales orders invoiced in %.3fs",
+                self._get_invoice_group_key(sales[0]),
+                len(sales),
+                time.perf_counter() - start,
+            )
+        return "{} create invoice successfully".format(sales)
+
+    def _get_invoice_group_key(self, sale):
+        """Key of the sales orders which can share the same invoice"""
+        workflow = sale.with_company(sale.company_id).workflow_process_id
+        invoice_date = False
+        if workflow.invoice_date_is_order_date:
+            invoice_date = fields.Date.context_today(sale, sale.date_order)
+        return (
+            sale.company_id.id,
+            sale.partner_invoice_id.id,
+            sale.currency_id.id,
+            sale.fiscal_position_id.id,
+            workflow.property_journal_id.id,
+            invoice_date,
+        )
+
+    def _split_invoice_groups(self, sales):
+        """Split sales orders in groups sharing the same invoicing key"""
+        for key, group in groupby(sales, key=self._get_invoice_group_key):
+            yield sales.browse().concat(*group).with_company(key[0])
+
     @api.model
     def _create_invoices(self, create_filter):
         sale_obj = self.env["sale.order"]
         sales = sale_obj.search(create_filter)
         _logger.debug("Sale Orders to create Invoice: %s", sales.ids)
+        if self.env.context.get("auto_workflow_group_invoice"):
+            return self._run_batches(
+                "_do_create_invoice_batch",
+                self._split_invoice_groups(sales),
+                create_filter,
+            )
+        if self._get_batch_size():
+            return self._run_batches(
+                "_do_create_invoice_batch", self._split_batches(sales), create_filter
+            )
         for sale in sales:
-            with savepoint(self.env.cr):
+            with savepoint(self.env.cr), self._track_metrics():
                 self._do_create_invoice(
                     sale.with_company(sale.company_id), create_filter
                 )
@@ -99,19 +368,34 @@ class AutomaticWorkflowJob(models.Model):
         if not self.env["account.move"].search_count(
             [("id", "=", invoice.id)] + domain_filter
         ):
+            self._add_bypassed_metrics()
             return "{} {} job bypassed".format(invoice.display_name, invoice)
         invoice.with_company(invoice.company_id).action_post()
         return "{} {} validate invoice successfully".format(
             invoice.display_name, invoice
         )
 
+    def _do_validate_invoice_batch(self, invoices, domain_filter):
+        """Validate a batch of invoices, filter ensure no duplication"""
+        invoices = self._filter_batch(invoices, domain_filter)
+        if not invoices:
+            return "{} job bypassed".format(invoices)
+        invoices.action_post()
+        return "{} validate invoice successfully".format(invoices)
+
     @api.model
     def _validate_invoices(self, validate_invoice_filter):
         move_obj = self.env["account.move"]
         invoices = move_obj.search(validate_invoice_filter)
         _logger.debug("Invoices to validate: %s", invoices.ids)
+        if self._get_batch_size():
+            return self._run_batches(
+                "_do_validate_invoice_batch",
+                self._split_batches(invoices),
+                validate_invoice_filter,
+            )
         for invoice in invoices:
-            with savepoint(self.env.cr):
+            with savepoint(self.env.cr), self._track_metrics():
                 self._do_validate_invoice(
                     invoice.with_company(invoice.company_id), validate_invoice_filter
                 )
@@ -121,6 +405,7 @@ class AutomaticWorkflowJob(models.Model):
         if not self.env["account.move"].search_count(
             [("id", "=", invoice.id)] + domain_filter
         ):
+            self._add_bypassed_metrics()
             return "{} {} job bypassed".format(invoice.display_name, invoice)
 
         # take the context from the actual action_invoice_sent method
@@ -151,13 +436,35 @@ class AutomaticWorkflowJob(models.Model):
 
         return "{} {} sent invoice successfully".format(invoice.display_name, invoice)
 
+    def _do_send_invoice_batch(self, invoices, domain_filter):
+        """Send a batch of invoices, filter ensure no duplication"""
+        invoices = self._filter_batch(invoices, domain_filter)
+        if not invoices:
+            return "{} job bypassed".format(invoices)
+        for template_xmlid, group in groupby(
+            invoices, key=lambda invoice: invoice._get_mail_template()
+        ):
+            template = self.env.ref(template_xmlid, raise_if_not_found=False)
+            if not template:
+                continue
+            group = invoices.browse().concat(*group)
+            self._post_mail_template(group, template)
+            group.sudo().write({"is_move_sent": True})
+        return "{} sent invoice successfully".format(invoices)
+
     @api.model
     def _send_invoices(self, send_invoice_filter):
         move_obj = self.env["account.move"]
         invoices = move_obj.search(send_invoice_filter)
         _logger.debug("Invoices to send: %s", invoices.ids)
+        if self._get_batch_size():
+            return self._run_batches(
+                "_do_send_invoice_batch",
+                self._split_batches(invoices),
+                send_invoice_filter,
+            )
         for invoice in invoices:
-            with savepoint(self.env.cr):
+            with savepoint(self.env.cr), self._track_metrics():
                 self._do_send_invoice(
                     invoice.with_company(invoice.company_id), send_invoice_filter
                 )
@@ -167,19 +474,34 @@ class AutomaticWorkflowJob(models.Model):
         if not self.env["stock.picking"].search_count(
             [("id", "=", picking.id)] + domain_filter
         ):
+            self._add_bypassed_metrics()
             return "{} {} job bypassed".format(picking.display_name, picking)
         picking.validate_picking()
         return "{} {} validate picking successfully".format(
             picking.display_name, picking
         )
 
+    def _do_validate_picking_batch(self, pickings, domain_filter):
+        """Validate a batch of stock.picking, filter ensure no duplication"""
+        pickings = self._filter_batch(pickings, domain_filter)
+        if not pickings:
+            return "{} job bypassed".format(pickings)
+        pickings.validate_picking()
+        return "{} validate picking successfully".format(pickings)
+
     @api.model
     def _validate_pickings(self, picking_filter):
         picking_obj = self.env["stock.picking"]
         pickings = picking_obj.search(picking_filter)
         _logger.debug("Pickings to validate: %s", pickings.ids)
+        if self._get_batch_size():
+            return self._run_batches(
+                "_do_validate_picking_batch",
+                self._split_batches(pickings),
+                picking_filter,
+            )
         for picking in pickings:
-            with savepoint(self.env.cr):
+            with savepoint(self.env.cr), self._track_metrics():
                 self._do_validate_picking(picking, picking_filter)
 
     def _do_sale_done(self, sale, domain_filter):
@@ -187,17 +509,30 @@ class AutomaticWorkflowJob(models.Model):
         if not self.env["sale.order"].search_count(
             [("id", "=", sale.id)] + domain_filter
         ):
+            self._add_bypassed_metrics()
             return "{} {} job bypassed".format(sale.display_name, sale)
         sale.action_done()
         return "{} {} set done successfully".format(sale.display_name, sale)
 
+    def _do_sale_done_batch(self, sales, domain_filter):
+        """Set a batch of sales orders to done, filter ensure no duplication"""
+        sales = self._filter_batch(sales, domain_filter)
+        if not sales:
+            return "{} job bypassed".format(sales)
+        sales.action_done()
+        return "{} set done successfully".format(sales)
+
     @api.model
     def _sale_done(self, sale_done_filter):
         sale_obj = self.env["sale.order"]
         sales = sale_obj.search(sale_done_filter)
         _logger.debug("Sale Orders to done: %s", sales.ids)
+        if self._get_batch_size():
+            return self._run_batches(
+                "_do_sale_done_batch", self._split_batches(sales), sale_done_filter
+            )
         for sale in sales:
-            with savepoint(self.env.cr):
+            with savepoint(self.env.cr), self._track_metrics():
                 self._do_sale_done(sale.with_company(sale.company_id), sale_done_filter)
 
     def _prepare_dict_account_payment(self, invoice):
@@ -214,13 +549,28 @@ class AutomaticWorkflowJob(models.Model):
             "date": fields.Date.context_today(self),
         }
 
+    def _do_register_payment_batch(self, invoices, domain_filter):
+        """Register the payments of a batch of invoices, filter ensure no
+        duplication"""
+        invoices = self._filter_batch(invoices, domain_filter)
+        if not invoices:
+            return "{} job bypassed".format(invoices)
+        self._register_payment_invoices(invoices)
+        return "{} register payment successfully".format(invoices)
+
     @api.model
     def _register_payments(self, payment_filter):
         invoice_obj = self.env["account.move"]
         invoices = invoice_obj.search(payment_filter)
         _logger.debug("Invoices to Register Payment: %s", invoices.ids)
+        if self._get_batch_size():
+            return self._run_batches(
+                "_do_register_payment_batch",
+                self._split_batches(invoices),
+                payment_filter,
+            )
         for invoice in invoices:
-            with savepoint(self.env.cr):
+            with savepoint(self.env.cr), self._track_metrics():
                 self._register_payment_invoice(invoice)
         return
 
@@ -229,54 +579,119 @@ class AutomaticWorkflowJob(models.Model):
             self._prepare_dict_account_payment(invoice)
         )
         payment.action_post()
+        self._reconcile_payment(payment, invoice)
 
+    def _reconcile_payment(self, payment, invoices):
         domain = [
             ("account_type", "in", ("asset_receivable", "liability_payable")),
             ("reconciled", "=", False),
         ]
         payment_lines = payment.line_ids.filtered_domain(domain)
-        lines = invoice.line_ids
+        lines = invoices.line_ids
         for account in payment_lines.account_id:
             (payment_lines + lines).filtered_domain(
                 [("account_id", "=", account.id), ("reconciled", "=", False)]
             ).reconcile()
 
+    def _get_payment_group_key(self, invoice, payment_vals):
+        """Key of the invoices which can be paid by the same payment: the
+        invoices having the same currency and the same payment values,
+        except the amount and the invoices"""
+        return (invoice.currency_id.id,) + tuple(
+            (field, str(value))
+            for field, value in sorted(payment_vals.items())
+            if field not in ("amount", "reconciled_invoice_ids")
+        )
+
+    def _register_payment_invoices(self, invoices):
+        """Register the payments of invoices in bulk
+
+        The invoices sharing the same partner, journal, currency... are paid
+        by a single payment. All the payments are created and posted at once,
+        then each payment is reconciled with its invoices.
+        """
+        grouped_vals = {}
+        grouped_invoices = defaultdict(list)
+        for invoice in invoices:
+            vals = self._prepare_dict_account_payment(invoice)
+            key = self._get_payment_group_key(invoice, vals)
+            if key in grouped_vals:
+                grouped_vals[key]["amount"] += vals["amount"]
+            else:
+                grouped_vals[key] = dict(vals, currency_id=invoice.currency_id.id)
+            grouped_invoices[key].append(invoice)
+        for key, vals in grouped_vals.items():
+            invoice_ids = [invoice.id for invoice in grouped_invoices[key]]
+            vals["reconciled_invoice_ids"] = [(6, 0, invoice_ids)]
+        payments = self.env["account.payment"].create(list(grouped_vals.values()))
+        payments.action_post()
+        for payment, key in zip(payments, grouped_vals):
+            self._reconcile_payment(
+                payment, invoices.browse().concat(*grouped_invoices[key])
+            )
+        return payments
+
     @api.model
     def run_with_workflow(self, sale_workflow):
-        workflow_domain = [("workflow_process_id", "=", sale_workflow.id)]
+        now = self.env.cr.now()
+        incremental_domain, full_scan = sale_workflow._get_incremental_domain(now)
+        workflow_domain = [
+            ("workflow_process_id", "=", sale_workflow.id)
+        ] + incremental_domain
+        if sale_workflow.batch_mode:
+            self = self.with_context(auto_workflow_batch_size=sale_workflow.batch_size)
         if sale_workflow.validate_order:
-            self.with_context(
-                send_order_confirmation_mail=sale_workflow.send_order_confirmation_mail
-            )._validate_sale_orders(
-                safe_eval(sale_workflow.order_filter_id.domain) + workflow_domain
-            )
+            with self._collect_metrics(sale_workflow, "validate_order") as job:
+                job.with_context(
+                    send_order_confirmation_mail=(
+                        sale_workflow.send_order_confirmation_mail
+                    )
+                )._validate_sale_orders(
+                    safe_eval(sale_workflow.order_filter_id.domain) + workflow_domain
+                )
         if sale_workflow.validate_picking:
-            self._validate_pickings(
-                safe_eval(sale_workflow.picking_filter_id.domain) + workflow_domain
-            )
+            with self._collect_metrics(sale_workflow, "validate_picking") as job:
+                job._validate_pickings(
+                    safe_eval(sale_workflow.picking_filter_id.domain) + workflow_domain
+                )
         if sale_workflow.create_invoice:
-            self._create_invoices(
-                safe_eval(sale_workflow.create_invoice_filter_id.domain)
-                + workflow_domain
-            )
+            with self._collect_metrics(sale_workflow, "create_invoice") as job:
+                job.with_context(
+                    auto_workflow_group_invoice=sale_workflow.group_invoice
+                )._create_invoices(
+                    safe_eval(sale_workflow.create_invoice_filter_id.domain)
+                    + workflow_domain
+                )
         if sale_workflow.validate_invoice:
-            self._validate_invoices(
-                safe_eval(sale_workflow.validate_invoice_filter_id.domain)
-                + workflow_domain
-            )
+            with self._collect_metrics(sale_workflow, "validate_invoice") as job:
+                job._validate_invoices(
+                    safe_eval(sale_workflow.validate_invoice_filter_id.domain)
+                    + workflow_domain
+                )
         if sale_workflow.send_invoice:
-            self._send_invoices(
-                safe_eval(sale_workflow.send_invoice_filter_id.domain) + workflow_domain
-            )
+            with self._collect_metrics(sale_workflow, "send_invoice") as job:
+                job._send_invoices(
+                    safe_eval(sale_workflow.send_invoice_filter_id.domain)
+                    + workflow_domain
+                )
         if sale_workflow.sale_done:
-            self._sale_done(
-                safe_eval(sale_workflow.sale_done_filter_id.domain) + workflow_domain
-            )
+            with self._collect_metrics(sale_workflow, "sale_done") as job:
+                job._sale_done(
+                    safe_eval(sale_workflow.sale_done_filter_id.domain)
+                    + workflow_domain
+                )
 
         if sale_workflow.register_payment:
-            self._register_payments(
-                safe_eval(sale_workflow.payment_filter_id.domain) + workflow_domain
-            )
+            with self._collect_metrics(sale_workflow, "register_payment") as job:
+                job._register_payments(
+                    safe_eval(sale_workflow.payment_filter_id.domain) + workflow_domain
+                )
+
+        if sale_workflow.incremental_mode:
+            vals = {"incremental_date": now}
+            if full_scan:
+                vals["incremental_full_scan_date"] = now
+            sale_workflow.write(vals)
 
     @api.model
     def run(self):
@@ -4,6 +4,7 @@
 # License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl).
 
 from odoo import _, api, fields, models
+from odoo.tools.sql import create_index
 
 
 class SaleOrder(models.Model):
@@ -20,6 +21,12 @@ class SaleOrder(models.Model):
         store=True,
     )
 
+    def init(self):
+        # used by the incremental mode of the automatic workflows
+        create_index(
+            self._cr, "sale_order_write_date_index", self._table, ["write_date"]
+        )
+
     @api.depends("delivery_status")
     def _compute_all_qty_delivered(self):
         for order in self:
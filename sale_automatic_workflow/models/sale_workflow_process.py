@@ -3,7 +3,10 @@
 # Copyright 2016 Sodexis
 # License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl).
 
-from odoo import api, fields, models
+from datetime import timedelta
+
+from odoo import _, api, fields, models
+from odoo.exceptions import ValidationError
 
 
 class SaleWorkflowProcess(models.Model):
@@ -73,6 +76,13 @@ class SaleWorkflowProcess(models.Model):
         "The service sale order lines will be included and will be "
         "marked as delivered",
     )
+    group_invoice = fields.Boolean(
+        string="Consolidate Invoices",
+        help="If this box is checked, the sales orders sharing the same "
+        "invoice address, currency, company, fiscal position and journal "
+        "are invoiced together on a single invoice. When the invoice date is "
+        "the order date, only the orders of the same day are grouped.",
+    )
     sale_done = fields.Boolean()
     sale_done_filter_domain = fields.Text(
         string="Sale Done Filter Domain", related="sale_done_filter_id.domain"
@@ -142,3 +152,69 @@ class SaleWorkflowProcess(models.Model):
     payment_filter_domain = fields.Text(
         related="payment_filter_id.domain",
     )
+    batch_mode = fields.Boolean(
+        help="When checked, the records are processed by batches: the filter "
+        "is checked and the action is executed once for a whole batch. "
+        "When a batch fails, it is split until the failing records are found.",
+    )
+    batch_size = fields.Integer(default=100)
+
+    incremental_mode = fields.Boolean(
+        help="When checked, each run only examines the records modified "
+        "since the previous run, instead of searching the whole tables.",
+    )
+    incremental_date = fields.Datetime(
+        string="Last Incremental Run",
+        copy=False,
+        help="Records modified before this date (minus a safety margin) are "
+        "ignored by the incremental runs. Empty it to force a full scan.",
+    )
+    incremental_full_scan_interval = fields.Integer(
+        string="Full Scan Interval (hours)",
+        default=24,
+        help="Interval at which a full scan is done anyway, to catch the "
+        "records whose changes did not update their modification date and "
+        "to retry the records which failed. 0 disables the full scans.",
+    )
+    incremental_full_scan_date = fields.Datetime(
+        string="Last Full Scan", copy=False, readonly=True
+    )
+
+    run_log_ids = fields.One2many(
+        comodel_name="sale.workflow.run.log",
+        inverse_name="workflow_process_id",
+        string="Run Logs",
+        readonly=True,
+    )
+
+    def _get_incremental_margin(self):
+        """Margin applied on the date of the last run, so the records written
+        by transactions still running during the last run are not missed"""
+        return timedelta(minutes=5)
+
+    def _get_incremental_domain(self, now):
+        """Return the domain restricting the records examined by a run
+        started at ``now``, and whether the run is a full scan"""
+        self.ensure_one()
+        if not self.incremental_mode:
+            return [], True
+        full_scan = not self.incremental_date
+        if self.incremental_full_scan_interval:
+            interval = timedelta(hours=self.incremental_full_scan_interval)
+            full_scan = full_scan or (
+                not self.incremental_full_scan_date
+                or self.incremental_full_scan_date + interval <= now
+            )
+        if full_scan:
+            return [], True
+        since = self.incremental_date - self._get_incremental_margin()
+        return [("write_date", ">=", since)], False
+
+    @api.constrains("batch_mode", "batch_size")
+    def _check_batch_size(self):
+        for workflow in self:
+            if workflow.batch_mode and workflow.batch_size <= 0:
+                raise ValidationError(
+                    _("The batch size of the workflow %s must be positive.")
+                    % workflow.name
+                )
@@ -0,0 +1,60 @@
+# License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl).
+
+from datetime import timedelta
+
+from odoo import api, fields, models
+
+
+class SaleWorkflowRunLog(models.Model):
+    """Metrics of a step of an automatic workflow run"""
+
+    _name = "sale.workflow.run.log"
+    _description = "Sale Workflow Run Log"
+    _order = "date desc, id desc"
+
+    workflow_process_id = fields.Many2one(
+        comodel_name="sale.workflow.process",
+        required=True,
+        ondelete="cascade",
+        index=True,
+    )
+    date = fields.Datetime(required=True, default=fields.Datetime.now)
+    step = fields.Selection(
+        selection=[
+            ("validate_order", "Validate Order"),
+            ("validate_picking", "Confirm and Transfer Picking"),
+            ("create_invoice", "Create Invoice"),
+            ("validate_invoice", "Validate Invoice"),
+            ("send_invoice", "Send Invoice"),
+            ("sale_done", "Sale Done"),
+            ("register_payment", "Register Payment"),
+        ],
+        required=True,
+    )
+    record_count = fields.Integer(string="Records")
+    success_count = fields.Integer(string="Successes")
+    failure_count = fields.Integer(string="Failures")
+    bypassed_count = fields.Integer(
+        string="Bypassed",
+        help="Records skipped because they no longer matched the filter of "
+        "the step when they were processed",
+    )
+    duration = fields.Float(string="Duration (s)", digits=(16, 3))
+    query_count = fields.Integer(string="SQL Queries")
+    latency_p50 = fields.Float(
+        string="Latency p50 (s)",
+        digits=(16, 3),
+        help="Median processing time of a record. In batch mode, the "
+        "processing time of a record is the average of its batch.",
+    )
+    latency_p95 = fields.Float(
+        string="Latency p95 (s)",
+        digits=(16, 3),
+        help="95th percentile of the processing time of a record. In batch "
+        "mode, the processing time of a record is the average of its batch.",
+    )
+
+    @api.autovacuum
+    def _gc_run_logs(self):
+        limit_date = fields.Datetime.now() - timedelta(days=30)
+        self.search([("date", "<", limit_date)]).unlink()
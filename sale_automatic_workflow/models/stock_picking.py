@@ -5,6 +5,7 @@
 
 from odoo import fields, models
 from odoo.tools import float_compare
+from odoo.tools.sql import create_index
 
 
 class StockPicking(models.Model):
@@ -14,6 +15,12 @@ class StockPicking(models.Model):
         comodel_name="sale.workflow.process", string="Sale Workflow Process"
     )
 
+    def init(self):
+        # used by the incremental mode of the automatic workflows
+        create_index(
+            self._cr, "stock_picking_write_date_index", self._table, ["write_date"]
+        )
+
     def validate_picking(self):
         """Set quantities automatically and validate the pickings."""
         for picking in self:
@@ -6,6 +6,7 @@ from datetime import timedelta
 from unittest import mock
 
 from odoo import fields
+from odoo.exceptions import UserError, ValidationError
 from odoo.tests import tagged
 from odoo.tools.safe_eval import safe_eval
 
@@ -251,3 +252,219 @@ class TestAutomaticWorkflow(TestCommon, TestAutomaticWorkflowMixin):
         self.assertIn("job bypassed", res_create_invoice)
         self.assertIn("job bypassed", res_validate_invoice)
         self.assertIn("job bypassed", res_send_invoice)
+
+    def test_full_automatic_batch_mode(self):
+        workflow = self.create_full_automatic(
+            override={"batch_mode": True, "batch_size": 2}
+        )
+        sales = self.env["sale.order"]
+        for __ in range(3):
+            sales |= self.create_sale_order(workflow)
+        sales._onchange_workflow_process_id()
+        self.run_job()
+        for sale in sales:
+            self.assertEqual(sale.state, "sale")
+            self.assertEqual(len(sale.invoice_ids), 1)
+            self.assertEqual(sale.invoice_ids.state, "posted")
+        self.run_job()
+        self.assertEqual(set(sales.picking_ids.mapped("state")), {"done"})
+
+    def test_batch_mode_isolate_failure(self):
+        workflow = self.create_full_automatic(
+            override={"batch_mode": True, "batch_size": 10}
+        )
+        sales = self.env["sale.order"]
+        for __ in range(4):
+            sales |= self.create_sale_order(workflow)
+        failing_sale = sales[2]
+        sale_cls = type(self.env["sale.order"])
+        action_confirm = sale_cls.action_confirm
+
+        def action_confirm_failing(records):
+            if failing_sale in records:
+                raise UserError("Order cannot be confirmed")
+            return action_confirm(records)
+
+        with mock.patch.object(sale_cls, "action_confirm", action_confirm_failing):
+            self.run_job()
+        self.assertEqual(failing_sale.state, "draft")
+        self.assertEqual(set((sales - failing_sale).mapped("state")), {"sale"})
+
+    def test_batch_size_constraint(self):
+        workflow = self.create_full_automatic()
+        with self.assertRaises(ValidationError):
+            workflow.write({"batch_mode": True, "batch_size": 0})
+
+    def test_split_batches_without_company(self):
+        partners = self.env["res.partner"].create(
+            [
+                {"name": "Shared partner", "company_id": False},
+                {"name": "Company partner", "company_id": self.env.company.id},
+            ]
+        )
+        workflow_job = self.env["automatic.workflow.job"].with_context(
+            auto_workflow_batch_size=10
+        )
+        batches = list(workflow_job._split_batches(partners))
+        self.assertEqual(len(batches), 2)
+        self.assertEqual(sum(batches, partners.browse()), partners)
+
+    def test_group_invoice(self):
+        workflow = self.create_full_automatic(override={"group_invoice": True})
+        sale1 = self.create_sale_order(workflow)
+        sale2 = self.create_sale_order(
+            workflow, override={"partner_id": sale1.partner_id.id}
+        )
+        sale3 = self.create_sale_order(workflow)
+        sales = sale1 | sale2 | sale3
+        sales._onchange_workflow_process_id()
+        self.run_job()
+        self.assertEqual(set(sales.mapped("state")), {"sale"})
+        self.assertEqual(len(sale1.invoice_ids), 1)
+        self.assertEqual(sale1.invoice_ids, sale2.invoice_ids)
+        self.assertEqual(len(sale3.invoice_ids), 1)
+        self.assertNotEqual(sale1.invoice_ids, sale3.invoice_ids)
+        self.assertEqual(
+            set(sale1.invoice_ids.invoice_line_ids.sale_line_ids.order_id.ids),
+            set((sale1 | sale2).ids),
+        )
+
+    def test_group_invoice_order_date(self):
+        workflow = self.create_full_automatic(override={"group_invoice": True})
+        self.assertTrue(workflow.invoice_date_is_order_date)
+        sale1 = self.create_sale_order(workflow)
+        sale2 = self.create_sale_order(
+            workflow,
+            override={
+                "partner_id": sale1.partner_id.id,
+                "date_order": sale1.date_order - timedelta(days=2),
+            },
+        )
+        sales = sale1 | sale2
+        sales._onchange_workflow_process_id()
+        self.run_job()
+        self.assertEqual(len(sales.invoice_ids), 2)
+        for sale in sales:
+            self.assertEqual(
+                sale.invoice_ids.invoice_date,
+                fields.Date.context_today(sale, sale.date_order),
+            )
+
+    def test_incremental_mode(self):
+        workflow = self.create_full_automatic(override={"incremental_mode": True})
+        sale = self.create_sale_order(workflow)
+        # first run is a full scan
+        self.run_job()
+        self.assertEqual(sale.state, "sale")
+        self.assertTrue(workflow.incremental_date)
+        self.assertEqual(workflow.incremental_full_scan_date, workflow.incremental_date)
+        # a record not modified since the last run is ignored
+        sale2 = self.create_sale_order(workflow)
+        sale2.flush_recordset()
+        self.env.cr.execute(
+            "UPDATE sale_order SET write_date = %s WHERE id = %s",
+            (workflow.incremental_date - timedelta(days=1), sale2.id),
+        )
+        sale2.invalidate_recordset()
+        self.run_job()
+        self.assertEqual(sale2.state, "draft")
+        # until the next full scan
+        workflow.incremental_full_scan_date -= timedelta(days=1)
+        self.run_job()
+        self.assertEqual(sale2.state, "sale")
+
+    def test_run_log(self):
+        workflow = self.create_full_automatic(
+            override={"batch_mode": True, "batch_size": 10}
+        )
+        sales = self.create_sale_order(workflow) | self.create_sale_order(workflow)
+        failing_sale = sales[1]
+        sale_cls = type(self.env["sale.order"])
+        action_confirm = sale_cls.action_confirm
+
+        def action_confirm_failing(records):
+            if failing_sale in records:
+                raise UserError("Order cannot be confirmed")
+            return action_confirm(records)
+
+        with mock.patch.object(sale_cls, "action_confirm", action_confirm_failing):
+            self.run_job()
+        log = workflow.run_log_ids.filtered(
+            lambda run_log: run_log.step == "validate_order"
+        )
+        self.assertEqual(len(log), 1)
+        self.assertEqual(log.record_count, 2)
+        self.assertEqual(log.success_count, 1)
+        self.assertEqual(log.failure_count, 1)
+        self.assertTrue(log.query_count)
+        self.assertTrue(log.duration >= log.latency_p95 >= log.latency_p50 > 0)
+        self.assertIn("create_invoice", workflow.run_log_ids.mapped("step"))
+
+    def test_run_log_bypassed(self):
+        workflow = self.create_full_automatic()
+        sales = self.create_sale_order(workflow) | self.create_sale_order(workflow)
+        order_filter = safe_eval(workflow.order_filter_id.domain)
+        # confirmed meanwhile, e.g. by a user
+        sales[0].action_confirm()
+        workflow_job = self.env["automatic.workflow.job"]
+        with workflow_job._collect_metrics(workflow, "validate_order") as job:
+            job._do_batch("_do_validate_sale_order_batch", sales, order_filter)
+        self.assertEqual(set(sales.mapped("state")), {"sale"})
+        log = workflow.run_log_ids
+        self.assertEqual(log.record_count, 2)
+        self.assertEqual(log.success_count, 1)
+        self.assertEqual(log.bypassed_count, 1)
+        self.assertEqual(log.failure_count, 0)
+
+    def test_batch_mode_register_payment(self):
+        workflow = self.create_full_automatic(
+            override={"batch_mode": True, "register_payment": True}
+        )
+        sale1 = self.create_sale_order(workflow)
+        sale2 = self.create_sale_order(
+            workflow, override={"partner_id": sale1.partner_id.id}
+        )
+        sale3 = self.create_sale_order(workflow)
+        sales = sale1 | sale2 | sale3
+        sales._onchange_workflow_process_id()
+        self.run_job()
+        invoices = sales.invoice_ids
+        self.assertEqual(len(invoices), 3)
+        self.assertEqual(set(invoices.mapped("payment_state")), {"paid"})
+        payments = self.env["account.payment"].search(
+            [("partner_id", "in", sales.partner_id.ids)]
+        )
+        # the invoices of the same partner are paid by the same payment
+        self.assertEqual(len(payments), 2)
+        payment = payments.filtered(lambda p: p.partner_id == sale1.partner_id)
+        self.assertEqual(payment.amount, sum((sale1 | sale2).mapped("amount_total")))
+
+    def test_batch_mode_send_mails(self):
+        workflow = self.create_full_automatic(
+            override={"batch_mode": True, "send_order_confirmation_mail": True}
+        )
+        sales = self.create_sale_order(workflow) | self.create_sale_order(workflow)
+        sales._onchange_workflow_process_id()
+        sales.company_id.invoice_is_email = True
+        self.run_job()
+        comment = self.env.ref("mail.mt_comment")
+        for sale in sales:
+            self.assertEqual(sale.state, "sale")
+            self.assertTrue(
+                sale.message_ids.filtered(lambda m: m.subtype_id == comment)
+            )
+            invoice = sale.invoice_ids
+            self.assertTrue(invoice.is_move_sent)
+            messages = invoice.message_ids.filtered(lambda m: m.subtype_id == comment)
+            self.assertTrue(messages)
+            # the mails are queued, not sent during the workflow
+            mails = self.env["mail.mail"].search(
+                [("mail_message_id", "in", messages.ids)]
+            )
+            self.assertEqual(set(mails.mapped("state")), {"outgoing"})
+            # the attached PDF is not imported back on the posted invoice
+            self.assertFalse(
+                invoice.message_ids.filtered(
+                    lambda m: "not updated from the attachment" in (m.body or "")
+                )
+            )
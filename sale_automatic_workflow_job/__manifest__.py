@@ -12,5 +12,6 @@
     "depends": ["sale_automatic_workflow", "queue_job"],
     "data": [
         "data/queue_job_data.xml",
+        "views/sale_workflow_process_view.xml",
     ],
 }
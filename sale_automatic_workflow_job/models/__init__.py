@@ -1,2 +1,3 @@
 from . import automatic_workflow_job
 from . import queue_job
+from . import sale_workflow_process
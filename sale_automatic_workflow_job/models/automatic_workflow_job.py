@@ -1,8 +1,10 @@
 # Copyright 2020 Camptocamp (https://www.camptocamp.com)
 # License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl).
-from odoo import _, models
+from odoo import _, api, models
+from odoo.tools import groupby
 
-from odoo.addons.queue_job.job import identity_exact
+from odoo.addons.queue_job.job import ENQUEUED, PENDING, Job, identity_exact
+from odoo.addons.queue_job.utils import must_run_without_delay
 
 
 class AutomaticWorkflowJob(models.Model):
@@ -69,6 +71,83 @@ class AutomaticWorkflowJob(models.Model):
         with_context = self.with_context(auto_delay_do_sale_done=True)
         return super(AutomaticWorkflowJob, with_context)._sale_done(domain_filter)
 
+    @api.model
+    def _job_prepare_context_before_enqueue_keys(self):
+        # the batch jobs read the options of the workflow from the context
+        return super()._job_prepare_context_before_enqueue_keys() + (
+            "send_order_confirmation_mail",
+            "auto_workflow_group_invoice",
+        )
+
+    def _get_partition_key(self, record):
+        """Key of the records processed in the same partition job"""
+        return (record.company_id, record.partner_id.commercial_partner_id)
+
+    def _split_batches(self, records):
+        if not self.env.context.get("auto_workflow_partition"):
+            yield from super()._split_batches(records)
+            return
+        for (company, __), partition in groupby(records, key=self._get_partition_key):
+            yield records.browse().concat(*partition).with_company(company)
+
+    def _do_batch_job_options(self, method_name, records, domain_filter):
+        description = _("Automatic workflow {} on {} {}").format(
+            method_name, len(records), records._description
+        )
+        options = {
+            "description": description,
+            "identity_key": identity_exact,
+        }
+        if self.env.context.get("auto_workflow_partition"):
+            options["channel"] = self.env.ref(
+                "sale_automatic_workflow_job.channel_sale_automatic_workflow_partition"
+            ).complete_name
+        return options
+
+    def _run_batches(self, method_name, batches, domain_filter):
+        if self.env.context.get("job_uuid") or must_run_without_delay(self.env):
+            return super()._run_batches(method_name, batches, domain_filter)
+        jobs = []
+        for batch in batches:
+            args = (method_name, batch, domain_filter)
+            jobs.append(
+                Job(self._do_batch, args=args, **self._do_batch_job_options(*args))
+            )
+        self._enqueue_jobs(jobs)
+
+    def _enqueue_jobs(self, jobs):
+        """Store the jobs with a single insert, skipping the jobs having the
+        same identity key than a job waiting to be executed"""
+        job_model = self.env["queue.job"]
+        existing_keys = set(
+            job_model.sudo()
+            .search(
+                [
+                    ("identity_key", "in", [job.identity_key for job in jobs]),
+                    ("state", "in", [PENDING, ENQUEUED]),
+                ]
+            )
+            .mapped("identity_key")
+        )
+        vals_list = [
+            job._store_values(create=True)
+            for job in jobs
+            if job.identity_key not in existing_keys
+        ]
+        if vals_list:
+            job_model.with_context(
+                _job_edit_sentinel=job_model.EDIT_SENTINEL
+            ).sudo().create(vals_list)
+
+    def run_with_workflow(self, sale_workflow):
+        granularity = sale_workflow.job_granularity
+        if granularity in ("batch", "partner"):
+            self = self.with_context(
+                auto_workflow_batch_size=sale_workflow.batch_size,
+                auto_workflow_partition=granularity == "partner",
+            )
+        return super().run_with_workflow(sale_workflow)
+
     def _register_hook(self):
         mapping = {
             "_do_validate_sale_order": "auto_delay_do_validation",
@@ -19,3 +19,14 @@ class QueueJob(models.Model):
             "res_id": obj.id,
         }
         return action
+
+    def _related_action_sale_automatic_workflow_batch(self):
+        records = self.args[1]
+        action = {
+            "name": _("Sale Automatic Workflow Job"),
+            "type": "ir.actions.act_window",
+            "res_model": records._name,
+            "view_mode": "tree,form",
+            "domain": [("id", "in", records.ids)],
+        }
+        return action
@@ -0,0 +1,33 @@
+# Copyright 2020 Camptocamp (https://www.camptocamp.com)
+# License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl).
+from odoo import _, api, fields, models
+from odoo.exceptions import ValidationError
+
+
+class SaleWorkflowProcess(models.Model):
+    _inherit = "sale.workflow.process"
+
+    job_granularity = fields.Selection(
+        selection=[
+            ("record", "One job per record"),
+            ("batch", "One job per batch of records"),
+            ("partner", "One job per partner"),
+        ],
+        default="record",
+        required=True,
+        help="Records processed by each job. The jobs per partner are "
+        "executed on their own channel, so they can run in parallel without "
+        "locking the same records. When the batch mode is active, one job "
+        "is created per batch.",
+    )
+
+    @api.constrains("batch_mode", "batch_size", "job_granularity")
+    def _check_batch_size(self):
+        res = super()._check_batch_size()
+        for workflow in self:
+            if workflow.job_granularity != "record" and workflow.batch_size <= 0:
+                raise ValidationError(
+                    _("The batch size of the workflow %s must be positive.")
+                    % workflow.name
+                )
+        return res
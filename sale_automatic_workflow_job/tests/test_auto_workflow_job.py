@@ -3,7 +3,7 @@
 
 from odoo.tests import tagged
 
-from odoo.addons.queue_job.job import identity_exact
+from odoo.addons.queue_job.job import Job, identity_exact
 from odoo.addons.queue_job.tests.common import mock_with_delay
 from odoo.addons.sale_automatic_workflow.tests.common import (
     TestAutomaticWorkflowMixin,
@@ -136,3 +136,50 @@ class TestAutoWorkflowJob(TestCommon, TestAutomaticWorkflowMixin):
                 ],
             )
             self.assert_job_delayed(delayable_cls, delayable, "_do_sale_done", args)
+
+    def _get_batch_jobs(self, method_name, records):
+        jobs = self.env["queue.job"].search([("method_name", "=", "_do_batch")])
+        return jobs.filtered(
+            lambda job: job.args[0] == method_name and job.args[1] & records
+        )
+
+    def test_job_granularity_batch(self):
+        workflow = self.create_full_automatic(
+            override={"job_granularity": "batch", "batch_size": 2}
+        )
+        sales = self.env["sale.order"]
+        for __ in range(3):
+            sales |= self.create_sale_order(workflow)
+        self.run_job()  # run automatic workflow cron
+        jobs = self._get_batch_jobs("_do_validate_sale_order_batch", sales)
+        self.assertEqual(len(jobs), 2)
+        self.assertEqual(sorted(len(job.args[1]) for job in jobs), [1, 2])
+        self.assertEqual(
+            jobs.mapped("channel"), ["root.channel.sale.automatic.workflow"]
+        )
+        # no duplicated jobs when the cron runs again
+        self.run_job()
+        self.assertEqual(
+            self._get_batch_jobs("_do_validate_sale_order_batch", sales), jobs
+        )
+        for job in jobs:
+            Job.load(self.env, job.uuid).perform()
+        self.assertEqual(set(sales.mapped("state")), {"sale"})
+
+    def test_job_granularity_partner(self):
+        workflow = self.create_full_automatic(override={"job_granularity": "partner"})
+        sale1 = self.create_sale_order(workflow)
+        sale2 = self.create_sale_order(
+            workflow, override={"partner_id": sale1.partner_id.id}
+        )
+        sale3 = self.create_sale_order(workflow)
+        self.run_job()  # run automatic workflow cron
+        jobs = self._get_batch_jobs(
+            "_do_validate_sale_order_batch", sale1 | sale2 | sale3
+        )
+        self.assertEqual(len(jobs), 2)
+        self.assertIn(sale1 | sale2, jobs.mapped(lambda job: job.args[1]))
+        self.assertEqual(
+            jobs.mapped("channel"),
+            ["root.channel.sale.automatic.workflow.partition"],
+        )
@@ -30,3 +30,16 @@ class AutomaticWorkflowJob(models.Model):
             )
             return
         return super()._register_payment_invoice(invoice)
+
+    def _register_payment_invoices(self, invoices):
+        payable_invoices = invoices.filtered(
+            lambda invoice: invoice.payment_mode_id.fixed_journal_id
+        )
+        for invoice in invoices - payable_invoices:
+            _logger.debug(
+                "Unable to Register Payment for invoice %s: "
+                "Payment mode %s must have fixed journal",
+                invoice.id,
+                invoice.payment_mode_id.id,
+            )
+        return super()._register_payment_invoices(payable_invoices)
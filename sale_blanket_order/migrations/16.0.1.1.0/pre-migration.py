@@ -0,0 +1,42 @@
+# License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl).
+
+from odoo.tools.sql import column_exists, create_column
+
+QTY_FIELDS = [
+    "original_uom_qty",
+    "ordered_uom_qty",
+    "invoiced_uom_qty",
+    "delivered_uom_qty",
+    "remaining_uom_qty",
+]
+
+
+def migrate(cr, version):
+    """Fill the new stored quantities of the blanket orders from their lines
+    with a single query instead of letting the ORM compute them.
+    """
+    if not version or column_exists(cr, "sale_blanket_order", QTY_FIELDS[0]):
+        return
+    for field_name in QTY_FIELDS:
+        create_column(cr, "sale_blanket_order", field_name, "double precision")
+    cr.execute(
+        """
+        UPDATE sale_blanket_order bo
+        SET {assignments}
+        FROM (
+            SELECT bo2.id AS order_id, {sums}
+            FROM sale_blanket_order bo2
+            LEFT JOIN sale_blanket_order_line bol ON bol.order_id = bo2.id
+            GROUP BY bo2.id
+        ) AS totals
+        WHERE totals.order_id = bo.id
+        """.format(
+            assignments=", ".join(
+                "{name} = totals.{name}".format(name=name) for name in QTY_FIELDS
+            ),
+            sums=", ".join(
+                "COALESCE(SUM(bol.{name}), 0.0) AS {name}".format(name=name)
+                for name in QTY_FIELDS
+            ),
+        )
+    )
@@ -1,6 +1,8 @@
 # Copyright 2018 ACSONE SA/NV
 # License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl).
 
+from collections import defaultdict
+
 from odoo import SUPERUSER_ID, _, api, fields, models
 from odoo.exceptions import UserError
 from odoo.tools import float_is_zero
@@ -142,31 +144,31 @@ class BlanketOrder(models.Model):
     original_uom_qty = fields.Float(
         string="Original quantity",
         compute="_compute_uom_qty",
-        search="_search_original_uom_qty",
+        store=True,
         default=0.0,
     )
     ordered_uom_qty = fields.Float(
         string="Ordered quantity",
         compute="_compute_uom_qty",
-        search="_search_ordered_uom_qty",
+        store=True,
         default=0.0,
     )
     invoiced_uom_qty = fields.Float(
         string="Invoiced quantity",
         compute="_compute_uom_qty",
-        search="_search_invoiced_uom_qty",
+        store=True,
         default=0.0,
     )
     remaining_uom_qty = fields.Float(
         string="Remaining quantity",
         compute="_compute_uom_qty",
-        search="_search_remaining_uom_qty",
+        store=True,
         default=0.0,
     )
     delivered_uom_qty = fields.Float(
         string="Delivered quantity",
         compute="_compute_uom_qty",
-        search="_search_delivered_uom_qty",
+        store=True,
         default=0.0,
     )
 
@@ -178,8 +180,21 @@ class BlanketOrder(models.Model):
         self.line_count = len(self.mapped("line_ids"))
 
     def _compute_sale_count(self):
+        sale_orders = defaultdict(set)
+        if self.ids:
+            groups = self.env["sale.order.line"].read_group(
+                [("blanket_order_line.order_id", "in", self.ids)],
+                ["blanket_order_line", "order_id"],
+                ["blanket_order_line", "order_id"],
+                lazy=False,
+            )
+            bo_lines = self.env["sale.blanket.order.line"].browse(
+                [group["blanket_order_line"][0] for group in groups]
+            )
+            for group, bo_line in zip(groups, bo_lines):
+                sale_orders[bo_line.order_id.id].add(group["order_id"][0])
         for blanket_order in self:
-            blanket_order.sale_count = len(blanket_order._get_sale_orders())
+            blanket_order.sale_count = len(sale_orders[blanket_order.id])
 
     @api.depends(
         "line_ids.remaining_uom_qty",
@@ -208,13 +223,25 @@ class BlanketOrder(models.Model):
             else:
                 order.state = "open"
 
+    @api.depends(
+        "line_ids.original_uom_qty",
+        "line_ids.ordered_uom_qty",
+        "line_ids.invoiced_uom_qty",
+        "line_ids.delivered_uom_qty",
+        "line_ids.remaining_uom_qty",
+    )
     def _compute_uom_qty(self):
+        """Stored so that the blanket orders can be filtered and sorted by
+        these quantities, they are only recomputed for the orders whose
+        lines quantities change.
+        """
         for bo in self:
-            bo.original_uom_qty = sum(bo.mapped("line_ids.original_uom_qty"))
-            bo.ordered_uom_qty = sum(bo.mapped("line_ids.ordered_uom_qty"))
-            bo.invoiced_uom_qty = sum(bo.mapped("line_ids.invoiced_uom_qty"))
-            bo.delivered_uom_qty = sum(bo.mapped("line_ids.delivered_uom_qty"))
-            bo.remaining_uom_qty = sum(bo.mapped("line_ids.remaining_uom_qty"))
+            lines = bo.line_ids
+            bo.original_uom_qty = sum(lines.mapped("original_uom_qty"))
+            bo.ordered_uom_qty = sum(lines.mapped("ordered_uom_qty"))
+            bo.invoiced_uom_qty = sum(lines.mapped("invoiced_uom_qty"))
+            bo.delivered_uom_qty = sum(lines.mapped("delivered_uom_qty"))
+            bo.remaining_uom_qty = sum(lines.mapped("remaining_uom_qty"))
 
     @api.onchange("partner_id")
     def onchange_partner_id(self):
@@ -340,51 +367,6 @@ class BlanketOrder(models.Model):
         expired_orders.modified(["validity_date"])
         expired_orders.flush_recordset()
 
-    @api.model
-    def _search_original_uom_qty(self, operator, value):
-        bo_line_obj = self.env["sale.blanket.order.line"]
-        res = []
-        bo_lines = bo_line_obj.search([("original_uom_qty", operator, value)])
-        order_ids = bo_lines.mapped("order_id")
-        res.append(("id", "in", order_ids.ids))
-        return res
-
-    @api.model
-    def _search_ordered_uom_qty(self, operator, value):
-        bo_line_obj = self.env["sale.blanket.order.line"]
-        res = []
-        bo_lines = bo_line_obj.search([("ordered_uom_qty", operator, value)])
-        order_ids = bo_lines.mapped("order_id")
-        res.append(("id", "in", order_ids.ids))
-        return res
-
-    @api.model
-    def _search_invoiced_uom_qty(self, operator, value):
-        bo_line_obj = self.env["sale.blanket.order.line"]
-        res = []
-        bo_lines = bo_line_obj.search([("invoiced_uom_qty", operator, value)])
-        order_ids = bo_lines.mapped("order_id")
-        res.append(("id", "in", order_ids.ids))
-        return res
-
-    @api.model
-    def _search_delivered_uom_qty(self, operator, value):
-        bo_line_obj = self.env["sale.blanket.order.line"]
-        res = []
-        bo_lines = bo_line_obj.search([("delivered_uom_qty", operator, value)])
-        order_ids = bo_lines.mapped("order_id")
-        res.append(("id", "in", order_ids.ids))
-        return res
-
-    @api.model
-    def _search_remaining_uom_qty(self, operator, value):
-        bo_line_obj = self.env["sale.blanket.order.line"]
-        res = []
-        bo_lines = bo_line_obj.search([("remaining_uom_qty", operator, value)])
-        order_ids = bo_lines.mapped("order_id")
-        res.append(("id", "in", order_ids.ids))
-        return res
-
 
 class BlanketOrderLine(models.Model):
     _name = "sale.blanket.order.line"
@@ -634,28 +616,76 @@ class BlanketOrderLine(models.Model):
         "product_uom",
     )
     def _compute_quantities(self):
+        # Lines whose sale lines are all in database are computed with a
+        # grouped query, new records (e.g. in onchanges) from the cache
+        grouped_lines = self.filtered(lambda line: line.id and all(line.sale_lines.ids))
+        quantities = grouped_lines._get_sale_lines_quantities()
         for line in self:
-            sale_lines = line.sale_lines
-            line.ordered_uom_qty = sum(
-                sl.product_uom._compute_quantity(sl.product_uom_qty, line.product_uom)
-                for sl in sale_lines
-                if sl.order_id.state != "cancel" and sl.product_id == line.product_id
-            )
-            line.invoiced_uom_qty = sum(
-                sl.product_uom._compute_quantity(sl.qty_invoiced, line.product_uom)
-                for sl in sale_lines
-                if sl.order_id.state != "cancel" and sl.product_id == line.product_id
-            )
-            line.delivered_uom_qty = sum(
-                sl.product_uom._compute_quantity(sl.qty_delivered, line.product_uom)
-                for sl in sale_lines
-                if sl.order_id.state != "cancel" and sl.product_id == line.product_id
-            )
+            if line in grouped_lines:
+                ordered_qty, invoiced_qty, delivered_qty = quantities.get(
+                    line.id, (0.0, 0.0, 0.0)
+                )
+            else:
+                ordered_qty, invoiced_qty, delivered_qty = line._sum_sale_lines_qty()
+            line.ordered_uom_qty = ordered_qty
+            line.invoiced_uom_qty = invoiced_qty
+            line.delivered_uom_qty = delivered_qty
             line.remaining_uom_qty = line.original_uom_qty - line.ordered_uom_qty
             line.remaining_qty = line.product_uom._compute_quantity(
                 line.remaining_uom_qty, line.product_id.uom_id
             )
 
+    def _get_sale_lines_quantities(self):
+        """Aggregate the quantities of the sale lines per blanket line and UoM
+        in a single query, and convert them once per group.
+
+        :return: dict {blanket line id: (ordered, invoiced, delivered)}
+            expressed in the UoM of the blanket line
+        """
+        if not self:
+            return {}
+        groups = (
+            self.env["sale.order.line"]
+            .sudo()
+            .read_group(
+                [
+                    ("blanket_order_line", "in", self.ids),
+                    ("order_id.state", "!=", "cancel"),
+                ],
+                ["product_uom_qty:sum", "qty_invoiced:sum", "qty_delivered:sum"],
+                ["blanket_order_line", "product_id", "product_uom"],
+                lazy=False,
+            )
+        )
+        quantities = {}
+        for group in groups:
+            line = self.browse(group["blanket_order_line"][0])
+            product_id = group["product_id"] and group["product_id"][0]
+            if product_id != line.product_id.id or not group["product_uom"]:
+                continue
+            uom = self.env["uom.uom"].browse(group["product_uom"][0])
+            qties = [
+                uom._compute_quantity(group[fname], line.product_uom)
+                for fname in ("product_uom_qty", "qty_invoiced", "qty_delivered")
+            ]
+            previous = quantities.get(line.id, (0.0, 0.0, 0.0))
+            quantities[line.id] = tuple(map(sum, zip(previous, qties)))
+        return quantities
+
+    def _sum_sale_lines_qty(self):
+        self.ensure_one()
+        sale_lines = self.sale_lines.filtered(
+            lambda sl: sl.order_id.state != "cancel"
+            and sl.product_id == self.product_id
+        )
+        return tuple(
+            sum(
+                sl.product_uom._compute_quantity(sl[fname], self.product_uom)
+                for sl in sale_lines
+            )
+            for fname in ("product_uom_qty", "qty_invoiced", "qty_delivered")
+        )
+
     def _validate(self):
         try:
             for line in self:
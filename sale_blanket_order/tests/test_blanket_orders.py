@@ -424,3 +424,131 @@ class TestSaleBlanketOrders(common.TransactionCase):
         view_action = blanket_order.action_view_sale_orders()
         domain_ids = view_action["domain"][0][2]
         self.assertEqual(len(domain_ids), 3)
+
+    def test_07_stored_quantities(self):
+        """The quantities of the blanket order are stored and follow the
+        changes in the lines, so they can be used in search domains"""
+        blanket_order = self.blanket_order_obj.create(
+            {
+                "partner_id": self.partner.id,
+                "validity_date": fields.Date.to_string(self.tomorrow),
+                "payment_term_id": self.payment_term.id,
+                "pricelist_id": self.sale_pricelist.id,
+                "line_ids": [
+                    (
+                        0,
+                        0,
+                        {
+                            "product_id": self.product.id,
+                            "product_uom": self.product.uom_id.id,
+                            "original_uom_qty": 30.0,
+                            "price_unit": 30.0,
+                        },
+                    ),
+                    (
+                        0,
+                        0,
+                        {
+                            "product_id": self.product2.id,
+                            "product_uom": self.product2.uom_id.id,
+                            "original_uom_qty": 20.0,
+                            "price_unit": 60.0,
+                        },
+                    ),
+                ],
+            }
+        )
+        blanket_order.sudo().onchange_partner_id()
+        blanket_order.sudo().action_confirm()
+        self.assertEqual(blanket_order.original_uom_qty, 50.0)
+        self.assertEqual(blanket_order.remaining_uom_qty, 50.0)
+        self.assertEqual(blanket_order.ordered_uom_qty, 0.0)
+        self.assertEqual(blanket_order.sale_count, 0)
+
+        wizard = self.blanket_order_wiz_obj.with_context(
+            active_id=blanket_order.id, active_model="sale.blanket.order"
+        ).create({})
+        wizard.line_ids.filtered(lambda line: line.product_id == self.product).write(
+            {"qty": 10.0}
+        )
+        wizard.line_ids.filtered(lambda line: line.product_id == self.product2).write(
+            {"qty": 5.0}
+        )
+        wizard.sudo().create_sale_order()
+        self.assertEqual(blanket_order.ordered_uom_qty, 15.0)
+        self.assertEqual(blanket_order.remaining_uom_qty, 35.0)
+        self.assertEqual(blanket_order.sale_count, 1)
+
+        domain = [("id", "=", blanket_order.id)]
+        self.assertEqual(
+            self.blanket_order_obj.search(domain + [("remaining_uom_qty", "=", 35.0)]),
+            blanket_order,
+        )
+        self.assertFalse(
+            self.blanket_order_obj.search(domain + [("ordered_uom_qty", ">", 15.0)])
+        )
+        blanket_order.line_ids[0].original_uom_qty = 40.0
+        self.assertEqual(
+            self.blanket_order_obj.search(domain + [("remaining_uom_qty", "=", 45.0)]),
+            blanket_order,
+        )
+
+    def test_08_quantities_grouped_by_uom(self):
+        """The quantities of the blanket lines are aggregated per UoM and
+        ignore the cancelled orders"""
+        blanket_order = self.blanket_order_obj.create(
+            {
+                "partner_id": self.partner.id,
+                "validity_date": fields.Date.to_string(self.tomorrow),
+                "payment_term_id": self.payment_term.id,
+                "pricelist_id": self.sale_pricelist.id,
+                "line_ids": [
+                    (
+                        0,
+                        0,
+                        {
+                            "product_id": self.product.id,
+                            "product_uom": self.uom_dozen.id,
+                            "original_uom_qty": 10.0,
+                            "price_unit": 240.0,
+                        },
+                    )
+                ],
+            }
+        )
+        blanket_order.sudo().onchange_partner_id()
+        blanket_order.sudo().action_confirm()
+        bo_line = blanket_order.line_ids
+        sale_orders = self.so_obj.create(
+            [
+                {
+                    "partner_id": self.partner.id,
+                    "pricelist_id": self.sale_pricelist.id,
+                    "order_line": [
+                        (
+                            0,
+                            0,
+                            {
+                                "product_id": self.product.id,
+                                "product_uom": uom.id,
+                                "product_uom_qty": qty,
+                                "price_unit": 20.0,
+                                "blanket_order_line": bo_line.id,
+                            },
+                        )
+                    ],
+                }
+                for uom, qty in [
+                    (self.product.uom_id, 6.0),
+                    (self.product.uom_id, 18.0),
+                    (self.uom_dozen, 1.0),
+                    (self.uom_dozen, 2.0),
+                ]
+            ]
+        )
+        sale_orders[-1].action_cancel()
+        self.assertEqual(bo_line.ordered_uom_qty, 3.0)
+        self.assertEqual(bo_line.remaining_uom_qty, 7.0)
+        self.assertEqual(bo_line.remaining_qty, 84.0)
+        self.assertEqual(bo_line._get_sale_lines_quantities()[bo_line.id][0], 3.0)
+        self.assertEqual(bo_line._sum_sale_lines_qty()[0], 3.0)
@@ -8,7 +8,7 @@
     "website": "https://github.com/OCA/sale-workflow",
     "category": "Sale",
     "license": "AGPL-3",
-    "depends": ["sale"],
+    "depends": ["sale_currency_conversion_base"],
     "data": ["views/sale_order_view.xml"],
     "installable": True,
 }
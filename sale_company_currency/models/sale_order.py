@@ -23,11 +23,20 @@ class SaleOrder(models.Model):
         store=True,
     )
 
-    @api.depends("amount_total", "currency_rate")
+    @api.depends("amount_total", "currency_id", "company_id.currency_id", "date_order")
     def _compute_amount_company(self):
-        for order in self:
-            if order.currency_id.id == order.company_id.currency_id.id:
-                to_amount = order.amount_total
-            else:
-                to_amount = order.amount_total / order.currency_rate
-            order.amount_total_curr = to_amount
+        amounts = self.env["res.currency"]._convert_amounts(
+            [
+                (
+                    order.amount_total,
+                    order.currency_id or order.company_id.currency_id,
+                    order.company_id.currency_id,
+                    order.company_id,
+                    order.date_order,
+                )
+                for order in self
+            ],
+            round=False,
+        )
+        for order, amount in zip(self, amounts):
+            order.amount_total_curr = amount
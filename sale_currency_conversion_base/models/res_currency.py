@@ -0,0 +1,81 @@
+# License LGPL-3.0 or later (https://www.gnu.org/licenses/lgpl).
+
+from collections import defaultdict
+
+from odoo import api, fields, models
+
+CURRENCY_RATES = "sale_currency_conversion_base.currency_rates"
+
+
+class ResCurrency(models.Model):
+    _inherit = "res.currency"
+
+    @api.model
+    def _get_conversion_key(self, from_currency, to_currency, company, date):
+        return (
+            from_currency,
+            to_currency,
+            company or self.env.company,
+            fields.Date.to_date(date or fields.Date.context_today(self)),
+        )
+
+    @api.model
+    def _get_currency_rates_cache(self):
+        """Rates read in the transaction, {(company id, date): {currency id:
+        rate}}, dropped on commit, rollback or when a currency rate changes"""
+        return self.env.cr.precommit.data.setdefault(CURRENCY_RATES, {})
+
+    @api.model
+    def _invalidate_currency_rates_cache(self):
+        self.env.cr.precommit.data.pop(CURRENCY_RATES, None)
+
+    @api.model
+    def _get_conversion_rates(self, keys):
+        """Get the conversion rates of several (from currency, to currency,
+        company, date) keys, reading the rates missing from the transaction
+        cache once per company and date.
+
+        :param keys: iterable of (from currency, to currency, company, date)
+        :return: dict {key: rate}
+        """
+        keys = {self._get_conversion_key(*key) for key in keys}
+        cache = self._get_currency_rates_cache()
+        missing = defaultdict(lambda: self.browse())
+        for from_currency, to_currency, company, date in keys:
+            cached_rates = cache.get((company.id, date), {})
+            missing[(company, date)] |= (from_currency | to_currency).filtered(
+                lambda currency: currency.id not in cached_rates
+            )
+        for (company, date), currencies in missing.items():
+            if currencies:
+                cache.setdefault((company.id, date), {}).update(
+                    currencies._get_rates(company, date)
+                )
+        res = {}
+        for key in keys:
+            from_currency, to_currency, company, date = key
+            currency_rates = cache[(company.id, date)]
+            res[key] = currency_rates[to_currency.id] / currency_rates[from_currency.id]
+        return res
+
+    @api.model
+    def _convert_amounts(self, values, round=True):
+        """Convert several amounts at once, the bulk version of ``_convert``.
+
+        :param values: list of (amount, from currency, to currency, company,
+            date)
+        :return: list of the converted amounts, in the same order
+        """
+        rates = self._get_conversion_rates(
+            (from_currency, to_currency, company, date)
+            for _amount, from_currency, to_currency, company, date in values
+            if from_currency != to_currency
+        )
+        res = []
+        for amount, from_currency, to_currency, company, date in values:
+            if from_currency != to_currency:
+                amount *= rates[
+                    self._get_conversion_key(from_currency, to_currency, company, date)
+                ]
+            res.append(to_currency.round(amount) if round else amount)
+        return res
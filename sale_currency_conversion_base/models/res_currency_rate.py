@@ -0,0 +1,23 @@
+# License LGPL-3.0 or later (https://www.gnu.org/licenses/lgpl).
+
+from odoo import api, models
+
+
+class ResCurrencyRate(models.Model):
+    _inherit = "res.currency.rate"
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super().create(vals_list)
+        self.env["res.currency"]._invalidate_currency_rates_cache()
+        return records
+
+    def write(self, vals):
+        res = super().write(vals)
+        self.env["res.currency"]._invalidate_currency_rates_cache()
+        return res
+
+    def unlink(self):
+        res = super().unlink()
+        self.env["res.currency"]._invalidate_currency_rates_cache()
+        return res
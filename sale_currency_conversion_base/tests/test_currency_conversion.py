@@ -0,0 +1,51 @@
+# License LGPL-3.0 or later (https://www.gnu.org/licenses/lgpl).
+
+from odoo import fields
+from odoo.tests import TransactionCase
+
+
+class TestCurrencyConversion(TransactionCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.company = cls.env.company
+        cls.currency = cls.company.currency_id
+        cls.other_currency = cls.env["res.currency"].create(
+            {"name": "TST", "symbol": "T", "rounding": 0.01}
+        )
+        cls.date = fields.Date.to_date("2023-01-10")
+        cls.rate = cls.env["res.currency.rate"].create(
+            {
+                "name": "2023-01-01",
+                "rate": 2.0,
+                "currency_id": cls.other_currency.id,
+                "company_id": cls.company.id,
+            }
+        )
+
+    def test_convert_amounts(self):
+        Currency = self.env["res.currency"]
+        amounts = Currency._convert_amounts(
+            [
+                (10.0, self.currency, self.other_currency, self.company, self.date),
+                (10.0, self.other_currency, self.currency, self.company, self.date),
+                (10.0, self.currency, self.currency, self.company, self.date),
+            ]
+        )
+        expected = [
+            self.currency._convert(10.0, self.other_currency, self.company, self.date),
+            self.other_currency._convert(10.0, self.currency, self.company, self.date),
+            10.0,
+        ]
+        self.assertEqual(amounts, expected)
+
+    def test_conversion_rates_cache(self):
+        Currency = self.env["res.currency"]
+        key = (self.currency, self.other_currency, self.company, self.date)
+        self.assertEqual(Currency._get_conversion_rates([key]), {key: 2.0})
+        # the rates read are reused in the transaction
+        with self.assertQueryCount(0):
+            Currency._get_conversion_rates([key])
+        # a changed rate is read again
+        self.rate.rate = 4.0
+        self.assertEqual(Currency._get_conversion_rates([key]), {key: 4.0})
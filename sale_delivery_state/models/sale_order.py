@@ -29,20 +29,23 @@ class SaleOrder(models.Model):
         ),
     )
 
-    def _all_qty_delivered(self):
+    def _all_qty_delivered(self, precision=None):
         """
         Returns True if all line have qty_delivered >= to ordered quantities
 
         If `delivery` module is installed, ignores the lines with delivery costs
 
+        :param precision: optional precision digits, to avoid reading it for
+          each order
         :returns: boolean
         """
         self.ensure_one()
         # Skip delivery costs lines
         sale_lines = self.order_line.filtered(lambda rec: not rec._is_delivery())
-        precision = self.env["decimal.precision"].precision_get(
-            "Product Unit of Measure"
-        )
+        if precision is None:
+            precision = self.env["decimal.precision"].precision_get(
+                "Product Unit of Measure"
+            )
         return all(
             float_compare(
                 line.qty_delivered, line.product_uom_qty, precision_digits=precision
@@ -51,18 +54,21 @@ class SaleOrder(models.Model):
             for line in sale_lines
         )
 
-    def _partially_delivered(self):
+    def _partially_delivered(self, precision=None):
         """
         Returns True if at least one line is delivered
 
+        :param precision: optional precision digits, to avoid reading it for
+          each order
         :returns: boolean
         """
         self.ensure_one()
         # Skip delivery costs lines
         sale_lines = self.order_line.filtered(lambda rec: not rec._is_delivery())
-        precision = self.env["decimal.precision"].precision_get(
-            "Product Unit of Measure"
-        )
+        if precision is None:
+            precision = self.env["decimal.precision"].precision_get(
+                "Product Unit of Measure"
+            )
         return any(
             not float_is_zero(line.qty_delivered, precision_digits=precision)
             for line in sale_lines
@@ -70,16 +76,95 @@ class SaleOrder(models.Model):
 
     @api.depends("order_line.qty_delivered", "state", "force_delivery_state")
     def _compute_oca_delivery_status(self):
+        precision = self.env["decimal.precision"].precision_get(
+            "Product Unit of Measure"
+        )
         for order in self:
             if order.state in ("draft", "cancel"):
                 order.delivery_status = None
-            elif order.force_delivery_state or order._all_qty_delivered():
+            elif order.force_delivery_state or order._all_qty_delivered(precision):
                 order.delivery_status = "full"
-            elif order._partially_delivered():
+            elif order._partially_delivered(precision):
                 order.delivery_status = "partial"
             else:
                 order.delivery_status = "pending"
 
+    def _recompute_oca_delivery_status_sql(self):
+        """
+        Recompute the delivery status of the orders with a single query,
+        without loading the order lines.
+
+        It gives the same result as `_compute_oca_delivery_status`, as long as
+        the delivery costs lines are the ones flagged with `is_delivery`. It is
+        meant for large volumes of orders, like migrations, and only updates
+        the orders whose status changes.
+        """
+        if not self:
+            return
+        self.env.flush_all()
+        precision = self.env["decimal.precision"].precision_get(
+            "Product Unit of Measure"
+        )
+        delivery_line_clause = ""
+        if "is_delivery" in self.env["sale.order.line"]._fields:
+            delivery_line_clause = "AND NOT COALESCE(sol.is_delivery, false)"
+        self.env.cr.execute(
+            """
+            WITH lines AS (
+                SELECT so.id AS order_id,
+                    bool_and(
+                        round(
+                            (sol.qty_delivered - sol.product_uom_qty)::numeric,
+                            %(precision)s
+                        ) >= 0
+                    ) AS all_delivered,
+                    bool_or(
+                        round(sol.qty_delivered::numeric, %(precision)s) != 0
+                    ) AS partially_delivered
+                FROM sale_order so
+                LEFT JOIN sale_order_line sol
+                    ON sol.order_id = so.id {delivery_line_clause}
+                WHERE so.id IN %(ids)s
+                GROUP BY so.id
+            ), status AS (
+                SELECT so.id,
+                    CASE
+                        WHEN so.state IN ('draft', 'cancel') THEN NULL
+                        WHEN so.force_delivery_state
+                            OR COALESCE(lines.all_delivered, true) THEN 'full'
+                        WHEN lines.partially_delivered THEN 'partial'
+                        ELSE 'pending'
+                    END AS delivery_status
+                FROM sale_order so
+                JOIN lines ON lines.order_id = so.id
+            )
+            UPDATE sale_order so
+            SET delivery_status = status.delivery_status
+            FROM status
+            WHERE status.id = so.id
+                AND so.delivery_status IS DISTINCT FROM status.delivery_status
+            RETURNING so.id
+            """.format(
+                delivery_line_clause=delivery_line_clause
+            ),
+            {"precision": precision, "ids": tuple(self.ids)},
+        )
+        updated_ids = [row[0] for row in self.env.cr.fetchall()]
+        self.invalidate_recordset(["delivery_status"])
+        # Mark the stored fields depending on the status for recompute
+        self.browse(updated_ids).modified(["delivery_status"])
+
+    @api.model
+    def _mass_recompute_oca_delivery_status(self, domain=None, batch_size=10000):
+        """
+        Recompute the delivery status of all the orders matching the domain,
+        by batches of `batch_size` orders. To be used from migration scripts
+        or hooks.
+        """
+        orders = self.search(domain or [])
+        for index in range(0, len(orders), batch_size):
+            orders[index : index + batch_size]._recompute_oca_delivery_status_sql()
+
     def action_force_delivery_state(self):
         self.write({"force_delivery_state": True})
 
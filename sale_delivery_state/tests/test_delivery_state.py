@@ -91,3 +91,45 @@ class TestDeliveryState(TransactionCase):
                     continue
                 line.qty_delivered = line.product_uom_qty
             self.assertEqual(self.order.delivery_status, "full")
+
+    def _reset_delivery_status(self):
+        self.env.flush_all()
+        self.env.cr.execute(
+            "UPDATE sale_order SET delivery_status = NULL WHERE id = %s",
+            [self.order.id],
+        )
+        self.order.invalidate_recordset(["delivery_status"])
+
+    def test_mass_recompute(self):
+        self.order.action_confirm()
+        self._reset_delivery_status()
+        self.env["sale.order"]._mass_recompute_oca_delivery_status(
+            [("id", "=", self.order.id)]
+        )
+        self.assertEqual(self.order.delivery_status, "pending")
+        self.order.order_line[0].qty_delivered = 2
+        self._reset_delivery_status()
+        self.order._recompute_oca_delivery_status_sql()
+        self.assertEqual(self.order.delivery_status, "partial")
+        for line in self.order.order_line:
+            line.qty_delivered = line.product_uom_qty
+        self._reset_delivery_status()
+        self.order._recompute_oca_delivery_status_sql()
+        self.assertEqual(self.order.delivery_status, "full")
+
+    def test_sql_recompute_modified(self):
+        self.order.action_confirm()
+        self._reset_delivery_status()
+        with mock.patch.object(type(self.order), "modified", autospec=True) as modified:
+            self.order._recompute_oca_delivery_status_sql()
+        # The stored fields depending on the updated status are recomputed
+        self.assertIn(
+            mock.call(self.order, ["delivery_status"]), modified.call_args_list
+        )
+        self.assertEqual(self.order.delivery_status, "pending")
+        # Unchanged orders are not notified
+        with mock.patch.object(type(self.order), "modified", autospec=True) as modified:
+            self.order._recompute_oca_delivery_status_sql()
+        self.assertNotIn(
+            mock.call(self.order, ["delivery_status"]), modified.call_args_list
+        )
@@ -0,0 +1 @@
+from . import sale_order_line
@@ -0,0 +1,52 @@
+# License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl).
+
+from odoo import api, models
+
+
+class SaleOrderLine(models.Model):
+    _inherit = "sale.order.line"
+
+    @api.model
+    def _get_last_sale_prices(
+        self, company, partner, products, partner_field="partner_id", by_date=True
+    ):
+        """Get the unit price of the last confirmed sale of each product.
+
+        @param company: Company of the sales orders
+        @param partner: Customer of the sales orders
+        @param products: Products to get the prices for
+        @param partner_field: Sales order field matched against ``partner``
+        @param by_date: Take the sale with the latest order date, otherwise the
+          most recently created sale order line
+        @return: Dictionary of prices by product id, only for the products that
+          have been sold
+        """
+        if not products or not partner:
+            return {}
+        self.flush_model(["order_id", "product_id", "price_unit"])
+        self.env["sale.order"].flush_model(
+            ["company_id", "date_order", "state", partner_field]
+        )
+        if by_date:
+            date_clause = "AND so.date_order IS NOT NULL"
+            order_by = "so.date_order DESC, so.id DESC, sol.id DESC"
+        else:
+            date_clause = ""
+            order_by = "sol.id DESC"
+        self.env.cr.execute(
+            """
+            SELECT DISTINCT ON (sol.product_id) sol.product_id, sol.price_unit
+            FROM sale_order_line sol
+            JOIN sale_order so ON so.id = sol.order_id
+            WHERE so.company_id = %s
+                AND so.{partner_field} = %s
+                {date_clause}
+                AND so.state NOT IN ('draft', 'sent', 'cancel')
+                AND sol.product_id IN %s
+            ORDER BY sol.product_id, {order_by}
+            """.format(
+                partner_field=partner_field, date_clause=date_clause, order_by=order_by
+            ),
+            [company.id, partner.id, tuple(products.ids)],
+        )
+        return dict(self.env.cr.fetchall())
@@ -0,0 +1 @@
+from . import test_last_sale_price
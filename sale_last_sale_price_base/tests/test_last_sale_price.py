@@ -0,0 +1,91 @@
+# License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl).
+
+from datetime import timedelta
+
+from odoo import fields
+from odoo.tests import TransactionCase
+
+
+class TestLastSalePrice(TransactionCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.env = cls.env(context=dict(cls.env.context, tracking_disable=True))
+        cls.partner = cls.env["res.partner"].create({"name": "Customer"})
+        cls.partner_delivery = cls.env["res.partner"].create(
+            {"name": "Delivery", "parent_id": cls.partner.id, "type": "delivery"}
+        )
+        cls.product_1 = cls.env["product.product"].create({"name": "Product 1"})
+        cls.product_2 = cls.env["product.product"].create({"name": "Product 2"})
+        cls.product_3 = cls.env["product.product"].create({"name": "Product 3"})
+        now = fields.Datetime.now()
+        cls._create_order(
+            now - timedelta(days=2), {cls.product_1: 10.0, cls.product_2: 20.0}
+        )
+        cls._create_order(
+            now - timedelta(days=1),
+            {cls.product_1: 11.0},
+            partner_shipping=cls.partner_delivery,
+        )
+        # neither the quotations nor the sales of other customers are used
+        cls._create_order(now, {cls.product_1: 12.0}, confirm=False)
+        cls._create_order(
+            now,
+            {cls.product_3: 30.0},
+            partner=cls.env["res.partner"].create({"name": "Other customer"}),
+        )
+
+    @classmethod
+    def _create_order(
+        cls, date_order, prices, partner=None, partner_shipping=None, confirm=True
+    ):
+        partner = partner or cls.partner
+        order = cls.env["sale.order"].create(
+            {
+                "partner_id": partner.id,
+                "partner_shipping_id": (partner_shipping or partner).id,
+                "order_line": [
+                    (0, 0, {"product_id": product.id, "price_unit": price})
+                    for product, price in prices.items()
+                ],
+            }
+        )
+        if confirm:
+            order.action_confirm()
+        order.date_order = date_order
+        return order
+
+    def test_last_sale_prices(self):
+        products = self.product_1 + self.product_2 + self.product_3
+        line_model = self.env["sale.order.line"]
+        prices = line_model._get_last_sale_prices(
+            self.env.company, self.partner, products
+        )
+        self.assertEqual(prices, {self.product_1.id: 11.0, self.product_2.id: 20.0})
+        prices = line_model._get_last_sale_prices(
+            self.env.company,
+            self.partner_delivery,
+            products,
+            partner_field="partner_shipping_id",
+        )
+        self.assertEqual(prices, {self.product_1.id: 11.0})
+        self.assertFalse(
+            line_model._get_last_sale_prices(
+                self.env.company, self.partner, products.browse()
+            )
+        )
+
+    def test_last_sale_prices_by_line(self):
+        # The latest order date wins, unless the latest line is asked for
+        self._create_order(
+            fields.Datetime.now() - timedelta(days=5), {self.product_1: 9.0}
+        )
+        line_model = self.env["sale.order.line"]
+        prices = line_model._get_last_sale_prices(
+            self.env.company, self.partner, self.product_1
+        )
+        self.assertEqual(prices, {self.product_1.id: 11.0})
+        prices = line_model._get_last_sale_prices(
+            self.env.company, self.partner, self.product_1, by_date=False
+        )
+        self.assertEqual(prices, {self.product_1.id: 9.0})
@@ -8,7 +8,7 @@
     "website": "https://github.com/OCA/sale-workflow",
     "author": "Jarsa, Odoo Community Association (OCA)",
     "license": "LGPL-3",
-    "depends": ["sale"],
+    "depends": ["sale_currency_conversion_base"],
     "data": [
         "data/decimal_precision_data.xml",
         "views/sale_order.xml",
@@ -22,24 +22,27 @@ class SaleOrder(models.Model):
         related="company_id.sale_show_currency_rate",
     )
 
-    @api.depends("currency_id", "company_id.currency_id")
+    @api.depends("currency_id", "company_id.currency_id", "date_order")
     def _compute_currency_rate(self):
+        orders = self.filtered(
+            lambda order: order.currency_id
+            and order.currency_id != order.company_id.currency_id
+        )
+        Currency = self.env["res.currency"]
+        keys = {
+            order: Currency._get_conversion_key(
+                order.currency_id,
+                order.company_id.currency_id,
+                order.company_id,
+                order.date_order,
+            )
+            for order in orders
+        }
+        rates = Currency._get_conversion_rates(keys.values())
         for order in self:
-            if order.currency_id != order.company_id.currency_id:
-                order.currency_rate = order.currency_id._convert(
-                    1.0,
-                    order.company_id.currency_id,
-                    order.company_id,
-                    order.date_order,
-                    round=False,
-                )
-                order.inverse_currency_rate = order.company_id.currency_id._convert(
-                    1.0,
-                    order.currency_id,
-                    order.company_id,
-                    order.date_order,
-                    round=False,
-                )
+            if order in orders:
+                order.currency_rate = rates[keys[order]]
+                order.inverse_currency_rate = 1.0 / order.currency_rate
             else:
                 order.currency_rate = 1.0
                 order.inverse_currency_rate = 1.0
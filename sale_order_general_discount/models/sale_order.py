@@ -1,8 +1,11 @@
 # Copyright 2018 Tecnativa - Sergio Teruel
 # License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
+from collections import defaultdict
+
 from lxml import etree
 
 from odoo import api, fields, models
+from odoo.tools import float_compare
 
 
 class SaleOrder(models.Model):
@@ -21,6 +24,54 @@ class SaleOrder(models.Model):
         for so in self:
             so.general_discount = so.partner_id.sale_discount
 
+    def write(self, vals):
+        if "general_discount" not in vals and "partner_id" not in vals:
+            return super().write(vals)
+        old_discounts = {order: order.general_discount for order in self}
+        res = super().write(vals)
+        precision = self.env["decimal.precision"].precision_get("Discount")
+        self.filtered(
+            lambda so: float_compare(
+                so.general_discount, old_discounts[so], precision_digits=precision
+            )
+        )._apply_general_discount()
+        return res
+
+    def _get_general_discount_field(self):
+        """Name of the sale order line field receiving the general discount"""
+        return "discount"
+
+    def action_apply_general_discount(self):
+        self._apply_general_discount()
+        return True
+
+    def _apply_general_discount(self):
+        """Set the general discount on all the lines of the orders at once.
+
+        The discount is written once per distinct general discount, and the
+        ORM then recomputes the amounts of all the written lines together,
+        instead of recomputing each line on its own.
+        """
+        field_name = self._get_general_discount_field()
+        if not field_name:
+            return
+        precision = self.env["decimal.precision"].precision_get("Discount")
+        line_ids_by_discount = defaultdict(list)
+        for order in self:
+            lines = order.order_line.filtered(
+                lambda line: not line.display_type
+                and float_compare(
+                    line[field_name],
+                    order.general_discount,
+                    precision_digits=precision,
+                )
+            )
+            line_ids_by_discount[order.general_discount] += lines.ids
+        line_model = self.env["sale.order.line"]
+        for discount, line_ids in line_ids_by_discount.items():
+            if line_ids:
+                line_model.browse(line_ids).write({field_name: discount})
+
     @api.model
     def get_view(self, view_id=None, view_type="form", **options):
         """The purpose of this is to write a context on "order_line" field
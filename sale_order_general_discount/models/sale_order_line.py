@@ -6,14 +6,13 @@ from odoo import api, models
 class SaleOrderLine(models.Model):
     _inherit = "sale.order.line"
 
-    @api.depends("order_id", "order_id.general_discount")
+    @api.depends("order_id")
     def _compute_discount(self):
+        """Changing the general discount of an order does not recompute its
+        lines one by one, it is applied on all of them at once when the order
+        is written, see `sale.order._apply_general_discount`."""
         res = super()._compute_discount()
         for line in self:
-            # We check the value of general_discount on origin too to cover
-            # the case where a discount was set to a value != 0 and then
-            # set again to 0 to remove the discount on all the lines at the same
-            # time
-            if line.order_id.general_discount or line.order_id._origin.general_discount:
+            if line.order_id.general_discount:
                 line.discount = line.order_id.general_discount
         return res
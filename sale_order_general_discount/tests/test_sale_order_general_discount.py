@@ -1,5 +1,7 @@
 # Copyright 2018 Tecnativa - Sergio Teruel
 # License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
+from unittest import mock
+
 from lxml import etree
 
 from odoo.tests import TransactionCase
@@ -125,3 +127,40 @@ class TestSaleOrderLineInput(TransactionCase):
         order_line2 = self.env["sale.order.line"].create(vals)
         self.assertEqual(order_line2.price_subtotal, 800.00)
         self.assertEqual(order_line2.discount, 20)
+
+    def test_apply_general_discount(self):
+        self.order.order_line.copy({"order_id": self.order.id, "discount": 5})
+        self.order.general_discount = 20
+        self.assertEqual(self.order.order_line.mapped("discount"), [20, 20])
+        self.assertEqual(self.order.order_line.mapped("price_subtotal"), [800, 800])
+        self.assertEqual(self.order.amount_untaxed, 1600)
+        # Lines changed afterwards are reset by the explicit action
+        self.order.order_line[0].discount = 50
+        self.order.action_apply_general_discount()
+        self.assertEqual(self.order.order_line[0].discount, 20)
+        self.assertEqual(self.order.order_line[0].price_subtotal, 800)
+        self.assertEqual(
+            self.order.amount_total, sum(self.order.order_line.mapped("price_total"))
+        )
+        # Removing the general discount removes it from all the lines
+        self.order.general_discount = 0
+        self.assertEqual(self.order.order_line.mapped("discount"), [0, 0])
+        self.assertEqual(self.order.amount_untaxed, 2000)
+
+    def test_apply_general_discount_recompute(self):
+        orders = self.order | self.order.copy()
+        line_cls = type(self.env["sale.order.line"])
+        compute_amount = line_cls._compute_amount
+        computed_lines = []
+
+        def _compute_amount(lines):
+            computed_lines.append(lines)
+            return compute_amount(lines)
+
+        with mock.patch.object(line_cls, "_compute_amount", _compute_amount):
+            orders.general_discount = 20
+            orders.order_line.flush_recordset()
+        # the amounts of the lines of both orders are computed at once, by
+        # the amounts computation of the lines and its overrides
+        self.assertIn(orders.order_line, computed_lines)
+        self.assertEqual(orders.order_line.mapped("price_subtotal"), [800, 800])
@@ -1,11 +1,10 @@
-from odoo import api, models
+from odoo import models
 
 
 class SaleOrder(models.Model):
     _inherit = "sale.order"
 
-    @api.onchange("general_discount")
-    def onchange_general_discount(self):
+    def _get_general_discount_field(self):
         general_discount = (
             self.env["ir.config_parameter"]
             .sudo()
@@ -13,9 +12,9 @@ class SaleOrder(models.Model):
                 "sale_order_general_discount_triple.general_discount", "discount"
             )
         )
-        if general_discount != "no_apply":
-            for record in self:
-                record.order_line.update({general_discount: record.general_discount})
+        if general_discount not in self.env["sale.order.line"]._discount_fields():
+            return False
+        return general_discount
 
     def _create_delivery_line(self, carrier, price_unit):
         res = super()._create_delivery_line(carrier, price_unit)
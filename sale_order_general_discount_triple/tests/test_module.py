@@ -42,3 +42,15 @@ class TestModule(TransactionCase):
         sale = sale_form.save()
         self.assertEqual(sale.order_line.discount2, 10)
         self.assertEqual(sale.order_line.discount, 20)
+
+    def test_apply_general_discount(self):
+        sale = self.env["sale.order"].create(
+            {
+                "partner_id": self.partner.id,
+                "pricelist_id": self.pricelist.id,
+                "order_line": [(0, 0, {"product_id": self.product.id})],
+            }
+        )
+        self.assertEqual(sale.order_line.discount2, 10)
+        sale.general_discount = 30
+        self.assertEqual(sale.order_line.discount2, 30)
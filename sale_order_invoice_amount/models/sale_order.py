@@ -1,5 +1,7 @@
 # Copyright (C) 2021 ForgeFlow S.L.
 # License LGPL-3.0 or later (https://www.gnu.org/licenses/lgpl.html)
+from collections import defaultdict
+
 from odoo import api, fields, models
 from odoo.tools.misc import formatLang
 
@@ -27,35 +29,26 @@ class SaleOrder(models.Model):
         "invoice_ids.state",
     )
     def _compute_invoice_amount(self):
+        orders = self.filtered("id")
+        invoiced_amounts = orders._get_invoiced_amounts()
+        uninvoiced_amounts = orders._get_uninvoiced_amounts()
         for rec in self:
             if rec.state != "cancel" and rec.invoice_ids:
-                rec.invoiced_amount = 0.0
-                for invoice in rec.invoice_ids:
-                    if invoice.state != "cancel":
-                        if (
-                            invoice.currency_id != rec.currency_id
-                            and rec.currency_id != invoice.company_currency_id
-                        ):
-                            rec.invoiced_amount += invoice.currency_id._convert(
-                                invoice.amount_total_signed,
-                                rec.currency_id,
-                                invoice.company_id,
-                                invoice.invoice_date or fields.Date.today(),
-                            )
-                        else:
-                            rec.invoiced_amount += invoice.amount_total_signed
-                # Uninvoiced amount could not be equal to total - invoiced amount.
-                # For example if the amount invoiced does not match with the price unit.
-                rec.uninvoiced_amount = max(
-                    0,
-                    sum(
+                if rec in orders:
+                    rec.invoiced_amount = invoiced_amounts.get(rec.id, 0.0)
+                    uninvoiced_amount = uninvoiced_amounts.get(rec.id, 0.0)
+                else:
+                    rec.invoiced_amount = rec._get_invoiced_amounts()[rec.id]
+                    uninvoiced_amount = sum(
                         (line.product_uom_qty - line.qty_invoiced)
                         * (line.price_total / line.product_uom_qty)
                         for line in rec.order_line.filtered(
                             lambda sl: sl.product_uom_qty > 0
                         )
-                    ),
-                )
+                    )
+                # Uninvoiced amount could not be equal to total - invoiced amount.
+                # For example if the amount invoiced does not match with the price unit.
+                rec.uninvoiced_amount = max(0, uninvoiced_amount)
             else:
                 rec.invoiced_amount = 0.0
                 if rec.state in ["draft", "sent", "cancel"]:
@@ -63,6 +56,119 @@ class SaleOrder(models.Model):
                 else:
                     rec.uninvoiced_amount = rec.amount_total
 
+    def _get_invoice_amount_buckets(self):
+        """Sum the totals of the invoices of the orders per order, invoice
+        currency, company and invoice date.
+
+        :return: list of (order id, currency id, company id, date, amount)
+        """
+        if all(self.ids):
+            self.env["account.move"].flush_model(
+                [
+                    "amount_total_signed",
+                    "company_id",
+                    "currency_id",
+                    "invoice_date",
+                    "move_type",
+                    "state",
+                ]
+            )
+            self.env["account.move.line"].flush_model(["move_id"])
+            self.env["sale.order.line"].flush_model(["invoice_lines", "order_id"])
+            self.env.cr.execute(
+                """
+                SELECT order_id, currency_id, company_id, invoice_date,
+                    SUM(amount_total_signed)
+                FROM (
+                    SELECT DISTINCT sol.order_id, am.id, am.currency_id,
+                        am.company_id, am.invoice_date, am.amount_total_signed
+                    FROM sale_order_line sol
+                    JOIN sale_order_line_invoice_rel rel
+                        ON rel.order_line_id = sol.id
+                    JOIN account_move_line aml ON aml.id = rel.invoice_line_id
+                    JOIN account_move am ON am.id = aml.move_id
+                    WHERE sol.order_id = ANY(%s)
+                        AND am.move_type IN ('out_invoice', 'out_refund')
+                        AND am.state != 'cancel'
+                ) AS invoices
+                GROUP BY order_id, currency_id, company_id, invoice_date
+                """,
+                (self.ids,),
+            )
+            return self.env.cr.fetchall()
+        buckets = defaultdict(float)
+        for rec in self:
+            for invoice in rec.invoice_ids.filtered(lambda i: i.state != "cancel"):
+                key = (
+                    rec.id,
+                    invoice.currency_id.id,
+                    invoice.company_id.id,
+                    invoice.invoice_date,
+                )
+                buckets[key] += invoice.amount_total_signed
+        return [key + (amount,) for key, amount in buckets.items()]
+
+    def _get_invoiced_amounts(self):
+        """Compute the invoiced amounts of the orders, converting the invoice
+        totals once per currency and date.
+
+        :return: dict {order id: invoiced amount}
+        """
+        invoiced_amounts = dict.fromkeys(self.ids, 0.0)
+        if not self:
+            return invoiced_amounts
+        today = fields.Date.today()
+        Currency = self.env["res.currency"]
+        Company = self.env["res.company"]
+        rates = {}
+        for (
+            order_id,
+            currency_id,
+            company_id,
+            invoice_date,
+            amount,
+        ) in self._get_invoice_amount_buckets():
+            order = self.browse(order_id)
+            company = Company.browse(company_id)
+            if (
+                currency_id != order.currency_id.id
+                and order.currency_id != company.currency_id
+            ):
+                key = (currency_id, order.currency_id.id, company_id, invoice_date)
+                if key not in rates:
+                    rates[key] = Currency._get_conversion_rate(
+                        Currency.browse(currency_id),
+                        order.currency_id,
+                        company,
+                        invoice_date or today,
+                    )
+                amount = order.currency_id.round(amount * rates[key])
+            invoiced_amounts[order_id] += amount
+        return invoiced_amounts
+
+    def _get_uninvoiced_amounts(self):
+        """Sum the amounts left to invoice of the lines of the orders with a
+        single query.
+
+        :return: dict {order id: uninvoiced amount}
+        """
+        if not self:
+            return {}
+        self.env["sale.order.line"].flush_model(
+            ["order_id", "price_total", "product_uom_qty", "qty_invoiced"]
+        )
+        self.env.cr.execute(
+            """
+            SELECT order_id,
+                SUM((product_uom_qty - qty_invoiced) * price_total / product_uom_qty)
+            FROM sale_order_line
+            WHERE order_id = ANY(%s) AND product_uom_qty > 0
+            GROUP BY order_id
+            """,
+            (self.ids,),
+        )
+        return {order_id: float(amount) for order_id, amount in self.env.cr.fetchall()}
+
     @api.depends(
         "order_line.tax_id",
         "order_line.price_unit",
@@ -76,8 +182,12 @@ class SaleOrder(models.Model):
     )
     def _compute_tax_totals(self):
         res = super()._compute_tax_totals()
+        lang_envs = {}
         for order in self:
-            lang_env = order.with_context(lang=order.partner_id.lang).env
+            lang = order.partner_id.lang
+            if lang not in lang_envs:
+                lang_envs[lang] = order.with_context(lang=lang).env
+            lang_env = lang_envs[lang]
             order.tax_totals.update(
                 {
                     "invoiced_amount": order.invoiced_amount,
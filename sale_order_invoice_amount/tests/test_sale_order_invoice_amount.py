@@ -397,3 +397,23 @@ class TestSaleOrderInvoiceAmount(common.TransactionCase):
             0.0,
             "Uninvoiced Amount should be calculated.",
         )
+
+    def test_04_sale_order_invoiced_amount_batch(self):
+        sale_order_2 = self.sale_order_1.copy({"partner_id": self.res_partner_2.id})
+        orders = self.sale_order_1 | sale_order_2
+        orders.action_confirm()
+        orders._create_invoices()
+        self.assertEqual(len(orders.invoice_ids), 2)
+        self.assertEqual(orders.mapped("invoiced_amount"), [363.0, 363.0])
+        self.assertEqual(orders.mapped("uninvoiced_amount"), [0.0, 0.0])
+        self.assertEqual(
+            orders._get_invoiced_amounts(),
+            {self.sale_order_1.id: 363.0, sale_order_2.id: 363.0},
+        )
+        sale_order_2.order_line[0].product_uom_qty = 20.0
+        self.assertEqual(
+            orders._get_uninvoiced_amounts(),
+            {self.sale_order_1.id: 0.0, sale_order_2.id: 121.0},
+        )
+        self.assertEqual(sale_order_2.uninvoiced_amount, 121.0)
+        self.assertEqual(self.sale_order_1.uninvoiced_amount, 0.0)
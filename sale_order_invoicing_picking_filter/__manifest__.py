@@ -4,13 +4,14 @@
 {
     "name": "Sale Order Invoicing Picking Filter",
     "summary": "Create invoices from sale orders based on the products in pickings.",
-    "version": "16.0.1.0.0",
+    "version": "16.0.1.1.0",
     "license": "AGPL-3",
     "author": "Sygel, Odoo Community Association (OCA)",
     "website": "https://github.com/OCA/sale-workflow",
     "category": "Invoicing",
     "depends": ["sale_stock", "stock_picking_invoice_link"],
     "data": [
+        "data/ir_cron.xml",
         "wizard/sale_make_invoice_advanced_views.xml",
         "views/stock_picking_views.xml",
     ],
@@ -0,0 +1,56 @@
+# Copyright 2023 Manuel Regidor <manuel.regidor@sygel.es>
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
+
+from odoo import api, fields, models
+from odoo.tools.sql import create_index
+
+
+class AccountMove(models.Model):
+    _inherit = "account.move"
+
+    invoice_origin_message_pending = fields.Boolean(
+        help="Technical field: the message linking this invoice to its sale "
+        "orders has not been posted yet.",
+        copy=False,
+    )
+
+    def init(self):
+        res = super().init()
+        create_index(
+            self.env.cr,
+            "account_move_invoice_origin_message_pending_index",
+            self._table,
+            ["id"],
+            where="invoice_origin_message_pending",
+        )
+        return res
+
+    def _post_invoice_origin_messages(self):
+        """Post the origin link to the sale orders of the invoices as notes,
+        creating all the messages at once.
+        """
+        if not self:
+            return
+        qweb = self.env["ir.qweb"]
+        bodies = {
+            move.id: qweb._render(
+                "mail.message_origin_link",
+                {"self": move, "origin": move.line_ids.sale_line_ids.order_id},
+                minimal_qcontext=True,
+            )
+            for move in self
+        }
+        self._message_log_batch(bodies)
+
+    @api.model
+    def _cron_post_invoice_origin_messages(self, limit=1000):
+        moves = self.search(
+            [("invoice_origin_message_pending", "=", True)], limit=limit
+        )
+        moves._post_invoice_origin_messages()
+        moves.write({"invoice_origin_message_pending": False})
+        if len(moves) == limit:
+            self.env.ref(
+                "sale_order_invoicing_picking_filter."
+                "ir_cron_post_invoice_origin_messages"
+            )._trigger()
@@ -1,11 +1,13 @@
 # Copyright 2023 Manuel Regidor <manuel.regidor@sygel.es>
 # License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
 
+from collections import defaultdict
 from itertools import groupby
 
 from odoo import api, models
 from odoo.exceptions import UserError
 from odoo.fields import Command
+from odoo.tools import str2bool
 
 
 class SaleOrder(models.Model):
@@ -72,18 +74,41 @@ class SaleOrder(models.Model):
             invoice_vals["invoice_line_ids"] = service_invoice_line_vals
             outgoing_invoice_vals_list.append(invoice_vals)
 
+    def _get_picking_moves_to_invoice(self, pickings):
+        """Group the invoiceable moves of the pickings by order and picking
+        type code in a single pass.
+
+        :return: dict {(sale.order, picking_type_code): stock.move}
+        """
+        moves_by_key = defaultdict(list)
+        for picking in pickings:
+            order = picking.sale_id
+            if order not in self:
+                continue
+            key = (order, picking.picking_type_code)
+            moves_by_key[key].extend(picking.move_ids.filtered("sale_line_id"))
+        return {
+            key: self.env["stock.move"].concat(*moves)
+            for key, moves in moves_by_key.items()
+        }
+
+    def _defer_invoice_origin_messages(self):
+        if "defer_invoice_origin_messages" in self.env.context:
+            return self.env.context["defer_invoice_origin_messages"]
+        return str2bool(
+            self.env["ir.config_parameter"]
+            .sudo()
+            .get_param("sale_order_invoicing_picking_filter.defer_origin_messages"),
+            default=False,
+        )
+
     def _create_invoices_from_pickings(self, pickings):
         outgoing_invoice_vals_list = []
         incoming_invoice_vals_list = []
+        moves_by_key = self._get_picking_moves_to_invoice(pickings)
         for order in self:
             for code in ["outgoing", "incoming"]:
-                move_ids = (
-                    pickings.filtered(
-                        lambda a: a.sale_id == order and a.picking_type_code == code
-                    )
-                    .mapped("move_ids")
-                    .filtered("sale_line_id")
-                )
+                move_ids = moves_by_key.get((order, code))
                 if move_ids:
                     invoice_vals = order._prepare_invoice()
                     invoice_line_vals = []
@@ -115,19 +140,31 @@ class SaleOrder(models.Model):
             incoming_invoice_vals_list = self.invoice_picking_group(
                 incoming_invoice_vals_list
             )
+        for invoice in incoming_invoice_vals_list:
+            invoice["move_type"] = "out_refund"
+
+        return self._create_picking_invoices(
+            outgoing_invoice_vals_list + incoming_invoice_vals_list
+        )
 
+    def _create_picking_invoices(self, invoice_vals_list):
+        """Create all the invoices at once and post their origin messages,
+        right away or from the scheduled action.
+        """
+        defer_messages = self._defer_invoice_origin_messages()
+        if defer_messages:
+            for invoice_vals in invoice_vals_list:
+                invoice_vals["invoice_origin_message_pending"] = True
         moves = self.env["account.move"]
-        if outgoing_invoice_vals_list:
-            moves += self.env["account.move"].sudo().create(outgoing_invoice_vals_list)
-        if incoming_invoice_vals_list:
-            for invoice in incoming_invoice_vals_list:
-                invoice["move_type"] = "out_refund"
-            moves += self.env["account.move"].sudo().create(incoming_invoice_vals_list)
-
-        for move in moves:
-            move.message_post_with_view(
-                "mail.message_origin_link",
-                values={"self": move, "origin": move.line_ids.sale_line_ids.order_id},
-                subtype_id=self.env["ir.model.data"]._xmlid_to_res_id("mail.mt_note"),
-            )
+        if invoice_vals_list:
+            moves = self.env["account.move"].sudo().create(invoice_vals_list)
+
+        if defer_messages:
+            if moves:
+                self.env.ref(
+                    "sale_order_invoicing_picking_filter."
+                    "ir_cron_post_invoice_origin_messages"
+                ).sudo()._trigger()
+        else:
+            moves._post_invoice_origin_messages()
         return moves
@@ -446,3 +446,65 @@ class TesSaleOrderInvoicingPickingFilter(TransactionCase):
         self.assertEqual(len(out_refund_invoice), 1)
         self.assertEqual(out_invoice.amount_untaxed, 2.0)
         self.assertEqual(out_refund_invoice.amount_untaxed, 14.0)
+
+    def _get_origin_messages(self, invoices):
+        return self.env["mail.message"].search(
+            [
+                ("model", "=", "account.move"),
+                ("res_id", "in", invoices.ids),
+                ("subtype_id", "=", self.env.ref("mail.mt_note").id),
+            ]
+        )
+
+    def test_invoice_origin_messages(self):
+        sale_order_1 = self.create_sale_order(self.partner_1, 2, 2)
+        sale_order_2 = self.create_sale_order(self.partner_2, 3, 2)
+        orders = sale_order_1 | sale_order_2
+        orders.action_confirm()
+        for picking in orders.picking_ids:
+            for move in picking.move_ids:
+                move.quantity_done = move.product_uom_qty
+            picking._action_done()
+        invoices = orders._create_invoices_from_pickings(orders.picking_ids)
+        self.assertEqual(len(invoices), 2)
+        self.assertEqual(invoices.invoice_line_ids.sale_line_ids, orders.order_line)
+        self.assertFalse(invoices.filtered("invoice_origin_message_pending"))
+        messages = self._get_origin_messages(invoices)
+        self.assertEqual(len(messages), 2)
+        for invoice in invoices:
+            message = messages.filtered(lambda m, inv=invoice: m.res_id == inv.id)
+            self.assertIn(invoice.invoice_origin, message.body)
+
+    def test_invoice_origin_messages_from_wizard(self):
+        self.env["ir.config_parameter"].sudo().set_param(
+            "sale_order_invoicing_picking_filter.defer_origin_messages", "True"
+        )
+        sale_order = self.create_sale_order(self.partner_1, 2, 2)
+        sale_order.action_confirm()
+        picking = sale_order.picking_ids
+        picking.move_ids.write({"quantity_done": 2})
+        picking._action_done()
+        wizard = self.create_invoicing_wizard([sale_order.id], [picking.id])
+        wizard.with_context(defer_invoice_origin_messages=False).create_invoices()
+        invoice = sale_order.invoice_ids
+        self.assertEqual(len(invoice), 1)
+        self.assertFalse(invoice.invoice_origin_message_pending)
+        message = self._get_origin_messages(invoice)
+        self.assertEqual(len(message), 1)
+        self.assertEqual(message.message_type, "notification")
+        self.assertIn(sale_order.name, message.body)
+
+    def test_invoice_origin_messages_deferred(self):
+        sale_order = self.create_sale_order(self.partner_1, 2, 2)
+        sale_order.action_confirm()
+        picking = sale_order.picking_ids
+        picking.move_ids.write({"quantity_done": 2})
+        picking._action_done()
+        invoices = sale_order.with_context(
+            defer_invoice_origin_messages=True
+        )._create_invoices_from_pickings(picking)
+        self.assertTrue(invoices.invoice_origin_message_pending)
+        self.assertFalse(self._get_origin_messages(invoices))
+        self.env["account.move"]._cron_post_invoice_origin_messages()
+        self.assertFalse(invoices.invoice_origin_message_pending)
+        self.assertEqual(len(self._get_origin_messages(invoices)), 1)
@@ -29,16 +29,19 @@ class SaleOrderLine(models.Model):
         ),
     )
 
-    def _all_qty_delivered(self):
+    def _all_qty_delivered(self, precision=None):
         """
         Returns True if line has qty_delivered >= to ordered quantities
 
+        :param precision: optional precision digits, to avoid reading it for
+          each line
         :returns: boolean
         """
         self.ensure_one()
-        precision = self.env["decimal.precision"].precision_get(
-            "Product Unit of Measure"
-        )
+        if precision is None:
+            precision = self.env["decimal.precision"].precision_get(
+                "Product Unit of Measure"
+            )
         return (
             float_compare(
                 self.qty_delivered, self.product_uom_qty, precision_digits=precision
@@ -46,17 +49,20 @@ class SaleOrderLine(models.Model):
             >= 0
         )
 
-    def _partially_delivered(self):
+    def _partially_delivered(self, precision=None):
         """
         Returns True if line has qty_delivered != to 0 and < ordered
         quantities.
 
+        :param precision: optional precision digits, to avoid reading it for
+          each line
         :returns: boolean
         """
         self.ensure_one()
-        precision = self.env["decimal.precision"].precision_get(
-            "Product Unit of Measure"
-        )
+        if precision is None:
+            precision = self.env["decimal.precision"].precision_get(
+                "Product Unit of Measure"
+            )
         return not float_is_zero(self.qty_delivered, precision_digits=precision)
 
     @api.depends("qty_delivered", "state", "force_delivery_state")
@@ -65,16 +71,83 @@ class SaleOrderLine(models.Model):
         If `delivery` module is installed, lines with delivery costs are marked
         as 'No delivery'.
         """
+        precision = self.env["decimal.precision"].precision_get(
+            "Product Unit of Measure"
+        )
         for line in self:
             if line.state in ("draft", "cancel") or line._is_delivery():
                 line.delivery_state = "no"
-            elif line.force_delivery_state or line._all_qty_delivered():
+            elif line.force_delivery_state or line._all_qty_delivered(precision):
                 line.delivery_state = "done"
-            elif line._partially_delivered():
+            elif line._partially_delivered(precision):
                 line.delivery_state = "partially"
             else:
                 line.delivery_state = "unprocessed"
 
+    def _recompute_sale_line_delivery_state_sql(self):
+        """
+        Recompute the delivery state of the lines with a single query.
+
+        It gives the same result as `_compute_sale_line_delivery_state`, as
+        long as the delivery costs lines are the ones flagged with
+        `is_delivery`. It is meant for large volumes of lines, like
+        migrations, and only updates the lines whose state changes.
+        """
+        if not self:
+            return
+        self.env.flush_all()
+        precision = self.env["decimal.precision"].precision_get(
+            "Product Unit of Measure"
+        )
+        delivery_line_clause = ""
+        if "is_delivery" in self._fields:
+            delivery_line_clause = "OR COALESCE(sol.is_delivery, false)"
+        self.env.cr.execute(
+            """
+            WITH state AS (
+                SELECT sol.id,
+                    CASE
+                        WHEN sol.state IN ('draft', 'cancel')
+                            {delivery_line_clause} THEN 'no'
+                        WHEN sol.force_delivery_state
+                            OR round(
+                                (sol.qty_delivered - sol.product_uom_qty)::numeric,
+                                %(precision)s
+                            ) >= 0 THEN 'done'
+                        WHEN round(sol.qty_delivered::numeric, %(precision)s) != 0
+                            THEN 'partially'
+                        ELSE 'unprocessed'
+                    END AS delivery_state
+                FROM sale_order_line sol
+                WHERE sol.id IN %(ids)s
+            )
+            UPDATE sale_order_line sol
+            SET delivery_state = state.delivery_state
+            FROM state
+            WHERE state.id = sol.id
+                AND sol.delivery_state IS DISTINCT FROM state.delivery_state
+            RETURNING sol.id
+            """.format(
+                delivery_line_clause=delivery_line_clause
+            ),
+            {"precision": precision, "ids": tuple(self.ids)},
+        )
+        updated_ids = [row[0] for row in self.env.cr.fetchall()]
+        self.invalidate_recordset(["delivery_state"])
+        # Mark the stored fields depending on the status for recompute
+        self.browse(updated_ids).modified(["delivery_state"])
+
+    @api.model
+    def _mass_recompute_sale_line_delivery_state(self, domain=None, batch_size=10000):
+        """
+        Recompute the delivery state of all the lines matching the domain, by
+        batches of `batch_size` lines. To be used from migration scripts or
+        hooks.
+        """
+        lines = self.search(domain or [])
+        for index in range(0, len(lines), batch_size):
+            lines[index : index + batch_size]._recompute_sale_line_delivery_state_sql()
+
     def action_force_delivery_state(self):
         self.write({"force_delivery_state": True})
 
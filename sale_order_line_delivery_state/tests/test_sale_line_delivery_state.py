@@ -114,3 +114,41 @@ class TestSaleLineDeliveryState(TransactionCase):
             self.order.order_line[0].qty_delivered = 3
             self.assertEqual(self.order.order_line[0].delivery_state, "done")
             self.assertEqual(self.order.order_line[1].delivery_state, "no")
+
+    def _reset_delivery_state(self):
+        self.env.flush_all()
+        self.env.cr.execute(
+            "UPDATE sale_order_line SET delivery_state = NULL WHERE order_id = %s",
+            [self.order.id],
+        )
+        self.order.order_line.invalidate_recordset(["delivery_state"])
+
+    def test_mass_recompute(self):
+        line = self.order.order_line[0]
+        self._reset_delivery_state()
+        line._recompute_sale_line_delivery_state_sql()
+        self.assertEqual(line.delivery_state, "no")
+        self.order.action_confirm()
+        self._reset_delivery_state()
+        self.env["sale.order.line"]._mass_recompute_sale_line_delivery_state(
+            [("order_id", "=", self.order.id)]
+        )
+        self.assertEqual(line.delivery_state, "unprocessed")
+        line.qty_delivered = 2
+        self._reset_delivery_state()
+        line._recompute_sale_line_delivery_state_sql()
+        self.assertEqual(line.delivery_state, "partially")
+        line.qty_delivered = 3
+        self._reset_delivery_state()
+        line._recompute_sale_line_delivery_state_sql()
+        self.assertEqual(line.delivery_state, "done")
+
+    def test_sql_recompute_modified(self):
+        line = self.order.order_line[0]
+        self.order.action_confirm()
+        self._reset_delivery_state()
+        with mock.patch.object(type(line), "modified", autospec=True) as modified:
+            line._recompute_sale_line_delivery_state_sql()
+        # The stored fields depending on the updated state are recomputed
+        self.assertIn(mock.call(line, ["delivery_state"]), modified.call_args_list)
+        self.assertEqual(line.delivery_state, "unprocessed")
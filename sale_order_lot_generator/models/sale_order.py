@@ -20,17 +20,9 @@ class SaleOrder(models.Model):
         return index_lot
 
     def generate_lot(self):
-        for rec in self:
-            index_lot = rec._get_max_lot_index() + 1
-            for line in rec.order_line:
-                if (
-                    line.product_id.auto_generate_prodlot
-                    and not line.lot_id
-                    and line.product_id.tracking != "none"
-                ):
-                    lot_id = line.create_lot(index_lot)
-                    index_lot += 1
-                    line.lot_id = lot_id
+        self.order_line.filtered(
+            lambda line: not line.lot_id and line._is_lot_auto_generated()
+        )._generate_lots()
 
     def action_confirm(self):
         self.generate_lot()
@@ -23,19 +23,59 @@ class SaleOrderLine(models.Model):
         vals = self._prepare_vals_lot_number(index_lot)
         return self.env["stock.lot"].create(vals)
 
+    def _is_lot_auto_generated(self):
+        self.ensure_one()
+        return (
+            self.product_id.auto_generate_prodlot and self.product_id.tracking != "none"
+        )
+
+    def _create_lots(self, next_indexes=None):
+        """Create the lots of the lines with a single create.
+
+        The lot indexes of each order follow the highest one already used on
+        the order, unless given in `next_indexes`, which is updated with the
+        indexes consumed.
+
+        :param next_indexes: optional dict of next lot index by order
+        :return: list of (line, lot) tuples
+        """
+        if next_indexes is None:
+            next_indexes = {}
+        vals_list = []
+        for line in self:
+            order = line.order_id
+            if order not in next_indexes:
+                next_indexes[order] = order._get_max_lot_index() + 1
+            vals_list.append(line._prepare_vals_lot_number(next_indexes[order]))
+            next_indexes[order] += 1
+        lots = self.env["stock.lot"].create(vals_list)
+        return list(zip(self, lots))
+
+    def _generate_lots(self):
+        """Create the lots of the lines with a single create and assign them.
+
+        Each line gets its own lot, so the lines are written one by one
+        through the ORM, and the updates are flushed together.
+        """
+        for line, lot in self._create_lots():
+            line.write({"lot_id": lot.id})
+
     @api.model_create_multi
     def create(self, values_list):
+        lines_values = []
         for values in values_list:
             line = self.new(values)
             # we create a lot before create a line because the super method
             # must create a procurement and move
             if (
                 line.order_id.state == "sale"
-                and line.product_id.auto_generate_prodlot
                 and not line.lot_id
-                and line.product_id.tracking != "none"
+                and line._is_lot_auto_generated()
             ):
-                index_lot = line.order_id._get_max_lot_index() + 1
-                lot_id = line.create_lot(index_lot)
-                values["lot_id"] = lot_id.id
+                lines_values.append((line, values))
+        if lines_values:
+            new_lines = self.browse().concat(*(line for line, _vals in lines_values))
+            lots = new_lines._create_lots()
+            for (_line, values), (_new_line, lot) in zip(lines_values, lots):
+                values["lot_id"] = lot.id
         return super().create(values_list)
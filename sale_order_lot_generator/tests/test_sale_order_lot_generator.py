@@ -70,3 +70,39 @@ class TestSaleOrderLotGenerator(test_common.SingleTransactionCase):
                 self.assertEqual(line.lot_id, self.sol2.lot_id)
             if line.product_id.id == self.prd_acoustic.id:
                 self.assertEqual(line.lot_id, self.sol3.lot_id)
+
+    def test_sale_order_lot_generator_bulk(self):
+        order = self.env["sale.order"].create(
+            {
+                "partner_id": self.env.ref("base.res_partner_18").id,
+                "order_line": [
+                    (0, 0, {"product_id": product.id, "product_uom_qty": 1})
+                    for product in (self.prd_flipover, self.prd_desk)
+                ],
+            }
+        )
+        order.action_confirm()
+        self.assertEqual(
+            order.order_line.lot_id.mapped("name"),
+            ["%s-%03d" % (order.name, index) for index in (1, 2)],
+        )
+        # The lots are stored on the lines
+        order.order_line.flush_recordset(["lot_id"])
+        self.env.cr.execute(
+            "SELECT lot_id FROM sale_order_line WHERE id IN %s ORDER BY id",
+            (tuple(order.order_line.ids),),
+        )
+        self.assertEqual(
+            [row[0] for row in self.env.cr.fetchall()], order.order_line.lot_id.ids
+        )
+        # Lines added at once to a confirmed order follow the used indexes
+        new_lines = self.env["sale.order.line"].create(
+            [
+                {"order_id": order.id, "product_id": product.id, "product_uom_qty": 1}
+                for product in (self.prd_acoustic, self.prd_flipover)
+            ]
+        )
+        self.assertEqual(
+            new_lines.lot_id.mapped("name"),
+            ["%s-%03d" % (order.name, index) for index in (3, 4)],
+        )
@@ -13,7 +13,7 @@
     "installable": True,
     "post_init_hook": "_post_init_hook",
     "uninstall_hook": "_uninstall_hook",
-    "depends": ["sale_stock"],
+    "depends": ["sale_last_sale_price_base", "sale_stock"],
     "data": [
         "security/ir.model.access.csv",
         "views/product_views.xml",
@@ -3,7 +3,7 @@
 # License AGPL-3 - See https://www.gnu.org/licenses/agpl-3.0.html
 
 from odoo import api, fields, models
-from odoo.tools import float_compare
+from odoo.tools import float_compare, groupby
 
 
 class SaleOrderPicker(models.Model):
@@ -48,15 +48,50 @@ class SaleOrderPicker(models.Model):
         sale_order = fields.first(self).order_id
         price_origin = sale_order.picker_price_origin or "pricelist"
         use_delivery_address = sale_order.use_delivery_address
-        for line in self:
-            if price_origin == "last_sale_price":
-                line.price_unit = line._get_last_sale_price_product(
+        if price_origin == "last_sale_price":
+            for _order, lines in groupby(self, key=lambda line: line.order_id):
+                lines = self.browse().concat(*lines)
+                prices = lines._get_last_sale_prices(
                     use_delivery_address=use_delivery_address
                 )
-            else:
-                line.price_unit = line.product_id.with_context(
-                    **line._get_picker_price_unit_context()
-                )._get_contextual_price()
+                for line in lines:
+                    line.price_unit = prices.get(line.product_id.id, 0.0)
+            return
+        prices = self._get_pricelist_prices()
+        for line in self:
+            line.price_unit = prices[line]
+
+    def _get_pricelist_prices(self):
+        """
+        Get the pricelist prices of the lines products. The pricelist rules are
+        computed once for all the lines sharing the same price context.
+        @return: Dictionary of prices by line
+        """
+        prices = {}
+        for context_items, lines in groupby(
+            self,
+            key=lambda line: tuple(
+                sorted(line._get_picker_price_unit_context().items())
+            ),
+        ):
+            lines = self.browse().concat(*lines)
+            context = dict(context_items)
+            pricelist = self.env["product.pricelist"].browse(context.get("pricelist"))
+            if not pricelist:
+                for line in lines:
+                    prices[line] = line.product_id.with_context(
+                        **context
+                    )._get_contextual_price()
+                continue
+            rule_prices = pricelist.with_context(**context)._compute_price_rule(
+                lines.product_id,
+                context.get("quantity", 1.0),
+                uom=self.env["uom.uom"].browse(context.get("uom")) or None,
+                date=context.get("date") or False,
+            )
+            for line in lines:
+                prices[line] = rule_prices[line.product_id.id][0]
+        return prices
 
     def _compute_qty_available(self):
         available_field = (
@@ -69,38 +104,39 @@ class SaleOrderPicker(models.Model):
         for line in self:
             line.qty_available = line.product_id[available_field]
 
-    def _get_last_sale_price_product(self, use_delivery_address=False):
+    def _get_last_sale_prices(self, use_delivery_address=False):
         """
-        Get last price from last order.
+        Get last prices from last orders of the lines products, which must
+        belong to the same sale order.
         Use sudo to read sale order from other users like as other commercials.
         """
-        self.ensure_one()
-        domain = [
-            ("company_id", "=", self.order_id.company_id.id),
-            ("state", "not in", ("draft", "sent", "cancel")),
-            ("product_id", "=", self.product_id.id),
-        ]
+        order = self.order_id
+        order.ensure_one()
         if use_delivery_address:
-            domain.append(
-                (
-                    "order_id.partner_shipping_id",
-                    "=",
-                    self.order_id.partner_shipping_id.id,
-                )
-            )
+            partner, partner_field = order.partner_shipping_id, "partner_shipping_id"
         else:
-            domain.append(("order_partner_id", "=", self.order_id.partner_id.id))
-        so_line = (
+            partner, partner_field = order.partner_id, "partner_id"
+        return (
             self.env["sale.order.line"]
             .sudo()
-            .search(
-                domain,
-                limit=1,
-                order="id DESC",
+            ._get_last_sale_prices(
+                order.company_id,
+                partner,
+                self.product_id,
+                partner_field=partner_field,
+                by_date=False,
             )
-            .with_context(prefetch_fields=False)
         )
-        return so_line.price_unit or 0.0
+
+    def _get_last_sale_price_product(self, use_delivery_address=False):
+        """
+        Get last price from last order.
+        Use sudo to read sale order from other users like as other commercials.
+        """
+        self.ensure_one()
+        return self._get_last_sale_prices(
+            use_delivery_address=use_delivery_address
+        ).get(self.product_id.id, 0.0)
 
     def add_to_cart(self):
         self.ensure_one()
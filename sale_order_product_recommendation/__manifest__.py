@@ -14,6 +14,7 @@
     "maintainers": ["sergio-teruel", "rafaelbn", "yajo"],
     "depends": [
         "sale",
+        "sale_last_sale_price_base",
     ],
     "data": [
         "security/ir.model.access.csv",
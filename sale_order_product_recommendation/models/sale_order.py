@@ -0,0 +1,31 @@
+# License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl).
+
+from odoo import models
+
+
+class SaleOrder(models.Model):
+    _inherit = "sale.order"
+
+    def _recommendation_history_fields(self):
+        """Fields moving the lines of the order to other rows of the history"""
+        return {"company_id", "partner_id", "partner_shipping_id", "date_order"}
+
+    def write(self, vals):
+        if not self._recommendation_history_fields() & set(vals):
+            return super().write(vals)
+        history = self.env["sale.order.recommendation.history"]
+        self.flush_recordset()
+        old_keys = history._get_line_keys(self.order_line.ids)
+        res = super().write(vals)
+        self.flush_recordset()
+        new_keys = history._get_line_keys(self.order_line.ids)
+        history._refresh_keys(old_keys | new_keys)
+        return res
+
+    def unlink(self):
+        history = self.env["sale.order.recommendation.history"]
+        self.flush_recordset()
+        old_keys = history._get_line_keys(self.order_line.ids)
+        res = super().unlink()
+        history._refresh_keys(old_keys)
+        return res
@@ -0,0 +1,53 @@
+# License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl).
+
+from odoo import api, models
+
+
+class SaleOrderLine(models.Model):
+    _inherit = "sale.order.line"
+
+    def _recommendation_history_key_fields(self):
+        """Fields moving the line to another row of the history"""
+        return {"product_id", "order_id"}
+
+    def _recommendation_history_fields(self):
+        """Fields changing the row of the history of the line"""
+        fields = self._recommendation_history_key_fields() | {"qty_delivered"}
+        if "is_delivery" in self._fields:
+            fields.add("is_delivery")
+        return fields
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        lines = super().create(vals_list)
+        history = self.env["sale.order.recommendation.history"]
+        history._refresh_keys(history._get_line_keys(lines.ids))
+        return lines
+
+    def write(self, vals):
+        if not self._recommendation_history_key_fields() & set(vals):
+            return super().write(vals)
+        # Refresh the rows the lines are leaving, the rows they are joining
+        # are refreshed by _write
+        history = self.env["sale.order.recommendation.history"]
+        self.flush_recordset()
+        old_keys = history._get_line_keys(self.ids)
+        res = super().write(vals)
+        self.flush_recordset()
+        history._refresh_keys(old_keys)
+        return res
+
+    def _write(self, vals):
+        res = super()._write(vals)
+        if self._recommendation_history_fields() & set(vals):
+            history = self.env["sale.order.recommendation.history"]
+            history._refresh_keys(history._get_line_keys(self.ids))
+        return res
+
+    def unlink(self):
+        history = self.env["sale.order.recommendation.history"]
+        self.flush_recordset()
+        old_keys = history._get_line_keys(self.ids)
+        res = super().unlink()
+        history._refresh_keys(old_keys)
+        return res
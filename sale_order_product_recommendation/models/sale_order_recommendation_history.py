@@ -0,0 +1,122 @@
+# License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl).
+
+from odoo import api, fields, models
+from odoo.tools.sql import create_index, create_unique_index
+
+# Columns identifying a row of the history
+HISTORY_KEY = "company_id, partner_id, partner_shipping_id, product_id, date"
+
+
+class SaleOrderRecommendationHistory(models.Model):
+    """Delivered quantities per customer, product and month
+
+    This table aggregates the delivered sales order lines, so the
+    recommendations can be found without reading all the past sales order
+    lines of the customer. It is kept up to date when the sales order lines
+    or their orders are modified.
+    """
+
+    _name = "sale.order.recommendation.history"
+    _description = "Sale order recommendation delivery history"
+    _log_access = False
+    _order = "date desc"
+
+    company_id = fields.Many2one("res.company", readonly=True)
+    partner_id = fields.Many2one("res.partner", readonly=True)
+    partner_shipping_id = fields.Many2one("res.partner", readonly=True)
+    product_id = fields.Many2one("product.product", readonly=True)
+    date = fields.Date(readonly=True, help="First day of the month")
+    times_delivered = fields.Integer(readonly=True)
+    units_delivered = fields.Float(readonly=True)
+
+    def init(self):
+        create_unique_index(
+            self._cr,
+            "sale_order_recommendation_history_key_uniq",
+            self._table,
+            [HISTORY_KEY],
+        )
+        create_index(
+            self._cr,
+            "sale_order_recommendation_history_shipping_index",
+            self._table,
+            ["company_id", "partner_shipping_id", "date"],
+        )
+        self._cr.execute("SELECT 1 FROM {} LIMIT 1".format(self._table))
+        if not self._cr.rowcount:
+            self._refresh_keys()
+
+    def _history_select_query(self):
+        """Query aggregating the delivered sales order lines, filtered by
+        the condition ``{where}``"""
+        extra_where = ""
+        if "is_delivery" in self.env["sale.order.line"]._fields:
+            extra_where = "AND NOT COALESCE(sol.is_delivery, false)"
+        return """
+            SELECT so.company_id,
+                so.partner_id,
+                COALESCE(so.partner_shipping_id, so.partner_id),
+                sol.product_id,
+                date_trunc('month', so.date_order)::date,
+                count(*),
+                sum(sol.qty_delivered)
+            FROM sale_order_line sol
+            JOIN sale_order so ON so.id = sol.order_id
+            WHERE sol.product_id IS NOT NULL
+                AND sol.qty_delivered != 0
+                {extra_where}
+                AND {{where}}
+            GROUP BY 1, 2, 3, 4, 5
+        """.format(
+            extra_where=extra_where
+        )
+
+    @api.model
+    def _get_line_keys(self, line_ids):
+        """Return the keys of the history rows the sales order lines belong to"""
+        if not line_ids:
+            return set()
+        self.env.cr.execute(
+            """
+            SELECT DISTINCT so.company_id,
+                so.partner_id,
+                COALESCE(so.partner_shipping_id, so.partner_id),
+                sol.product_id,
+                date_trunc('month', so.date_order)::date
+            FROM sale_order_line sol
+            JOIN sale_order so ON so.id = sol.order_id
+            WHERE sol.id IN %s AND sol.product_id IS NOT NULL
+            """,
+            [tuple(line_ids)],
+        )
+        return set(self.env.cr.fetchall())
+
+    @api.model
+    def _refresh_keys(self, keys=None):
+        """Recompute the history rows of the given keys from the sales order
+        lines, or the whole history when no keys are given"""
+        if keys is not None and not keys:
+            return
+        table = self._table
+        if keys is None:
+            self.env.cr.execute("DELETE FROM {}".format(table))
+            where, params = "TRUE", []
+        else:
+            keys = tuple(keys)
+            self.env.cr.execute(
+                "DELETE FROM {} WHERE ({}) IN %s".format(table, HISTORY_KEY),
+                [keys],
+            )
+            where = (
+                "(so.company_id, so.partner_id, "
+                "COALESCE(so.partner_shipping_id, so.partner_id), sol.product_id, "
+                "date_trunc('month', so.date_order)::date) IN %s"
+            )
+            params = [keys]
+        self.env.cr.execute(
+            "INSERT INTO {} ({}, times_delivered, units_delivered) {}".format(
+                table, HISTORY_KEY, self._history_select_query().format(where=where)
+            ),
+            params,
+        )
+        self.invalidate_model()
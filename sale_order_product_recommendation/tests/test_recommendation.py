@@ -267,6 +267,58 @@ class RecommendationCaseTests(RecommendationCase):
         wiz_line_prod2 = wizard.line_ids.filtered(lambda x: x.product_id == self.prod_2)
         self.assertEqual(wiz_line_prod2.price_unit, 89.00)
 
+    def test_recommendations_pricelist_rules(self):
+        self.pricelist.item_ids = [
+            (
+                0,
+                0,
+                {
+                    "applied_on": "0_product_variant",
+                    "product_id": self.prod_1.id,
+                    "min_quantity": 10,
+                    "compute_price": "fixed",
+                    "fixed_price": 20.0,
+                },
+            ),
+            (
+                0,
+                0,
+                {
+                    "applied_on": "0_product_variant",
+                    "product_id": self.prod_2.id,
+                    "compute_price": "fixed",
+                    "fixed_price": 45.0,
+                },
+            ),
+        ]
+        wizard = self.wizard()
+        wiz_line_prod1 = wizard.line_ids.filtered(lambda x: x.product_id == self.prod_1)
+        wiz_line_prod2 = wizard.line_ids.filtered(lambda x: x.product_id == self.prod_2)
+        wiz_line_prod3 = wizard.line_ids.filtered(lambda x: x.product_id == self.prod_3)
+        self.assertEqual(wiz_line_prod1.price_unit, 25.00)
+        self.assertEqual(wiz_line_prod2.price_unit, 45.00)
+        self.assertEqual(wiz_line_prod3.price_unit, 75.00)
+        wiz_line_prod1.units_included = 10
+        self.assertEqual(wiz_line_prod1.price_unit, 20.00)
+        self.assertEqual(wiz_line_prod2.price_unit, 45.00)
+
+    def test_last_sale_prices(self):
+        products = self.prod_1 + self.prod_2 + self.prod_3
+        prices = self.env["sale.order.line"]._get_last_sale_prices(
+            self.new_so.company_id, self.partner, products
+        )
+        self.assertEqual(
+            prices,
+            {self.prod_1.id: 24.50, self.prod_2.id: 49.50, self.prod_3.id: 74.50},
+        )
+        prices = self.env["sale.order.line"]._get_last_sale_prices(
+            self.new_so.company_id,
+            self.partner_delivery,
+            products,
+            partner_field="partner_shipping_id",
+        )
+        self.assertEqual(prices, {self.prod_2.id: 89.00})
+
     def test_recommendations_last_sale_price_to_sale_order(self):
         # Display product price from last sale order price
         wizard = self.wizard()
@@ -344,6 +396,44 @@ class RecommendationCaseTests(RecommendationCase):
         wizard.generate_recommendations()
         self.assertNotIn("service", wizard.line_ids.mapped("product_id.type"))
 
+    def test_recommendation_history(self):
+        history = self.env["sale.order.recommendation.history"]
+        domain = [
+            ("partner_id", "=", self.partner.id),
+            ("product_id", "=", self.prod_2.id),
+        ]
+        row = history.search(domain)
+        self.assertEqual(row.times_delivered, 2)
+        self.assertEqual(row.units_delivered, 100)
+        self.assertEqual(str(row.date), "2021-05-01")
+        # Delivered quantities are kept up to date
+        self.order2.order_line.qty_delivered = 20
+        self.assertEqual(history.search(domain).units_delivered, 70)
+        # Moving an order to another month moves its lines
+        self.order2.date_order = "2021-06-03"
+        rows = history.search(domain, order="date")
+        self.assertEqual(rows.mapped("times_delivered"), [1, 1])
+        self.assertEqual(rows.mapped("units_delivered"), [50, 20])
+        wizard = self.wizard()
+        wiz_line_prod2 = wizard.line_ids.filtered(lambda x: x.product_id == self.prod_2)
+        self.assertEqual(wiz_line_prod2.times_delivered, 2)
+        self.assertEqual(wiz_line_prod2.units_delivered, 70)
+        # Orders before the start of the period are ignored
+        self.order1.date_order = "2021-04-03"
+        wizard.generate_recommendations()
+        wiz_line_prod2 = wizard.line_ids.filtered(lambda x: x.product_id == self.prod_2)
+        self.assertEqual(wiz_line_prod2.times_delivered, 1)
+        self.assertFalse(
+            wizard.line_ids.filtered(lambda x: x.product_id == self.prod_1)
+        )
+        # Lines without delivered quantities are removed from the history
+        self.order2.order_line.qty_delivered = 0
+        self.assertFalse(
+            history.search(
+                domain + [("partner_shipping_id", "=", self.partner_delivery.id)]
+            )
+        )
+
     def test_no_recommendations_found(self):
         new_partner = self.partner.copy()
         self.new_so.partner_id = new_partner
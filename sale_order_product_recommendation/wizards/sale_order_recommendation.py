@@ -8,6 +8,7 @@ from datetime import datetime, timedelta
 from odoo import _, api, fields, models
 from odoo.exceptions import UserError
 from odoo.osv import expression
+from odoo.tools import groupby
 from odoo.tools.safe_eval import safe_eval
 
 _logger = logging.getLogger(__name__)
@@ -135,25 +136,155 @@ class SaleOrderRecommendation(models.TransientModel):
         self.line_ids = False
         return self._reopen_wizard()
 
-    def generate_recommendations(self):
-        """Generate lines according to context sale order."""
-        # Search delivered products in previous months
-        # Search with sudo for get sale order from other commercials users
-        found_lines = (
-            self.env["sale.order.line"]
+    def _read_recommendation_history(self, product_ids=None, limit=None):
+        """Read the delivered products from the recommendation history.
+
+        Whole months are read from the history table and the first, partial,
+        month of the period from the sales order lines, so the results are the
+        same as reading all the lines of the period.
+
+        @param product_ids: Optional list of products to restrict the search
+        @param limit: Optional maximum number of products to return
+        @return: List of dictionaries with the same keys as the read_group
+        """
+        start = datetime.now() - timedelta(days=self.months * 30)
+        # First day of the first whole month of the period
+        month_start = (start.replace(day=1) + timedelta(days=32)).replace(day=1)
+        month_start = month_start.replace(hour=0, minute=0, second=0, microsecond=0)
+        if self.use_delivery_address:
+            partner = self.order_id.partner_shipping_id
+            partner_field = "partner_shipping_id"
+        else:
+            partner = self.order_id.partner_id.commercial_partner_id
+            partner_field = "partner_id"
+        partner_ids = (
+            self.env["res.partner"]
             .sudo()
-            .read_group(
-                self._recommendable_sale_order_lines_domain(),
-                ["product_id", "qty_delivered"],
-                ["product_id"],
+            .with_context(active_test=False)
+            .search([("id", "child_of", partner.id)])
+            .ids
+        )
+        line_where = "sol.product_id IS NOT NULL AND sol.qty_delivered != 0"
+        if "is_delivery" in self.env["sale.order.line"]._fields:
+            line_where += " AND NOT COALESCE(sol.is_delivery, false)"
+        product_where = "TRUE"
+        if product_ids is not None:
+            product_where = "pp.id IN %(product_ids)s"
+        self.env.flush_all()
+        self.env.cr.execute(
+            """
+            WITH delivered AS (
+                SELECT product_id, times_delivered AS times,
+                    units_delivered AS units
+                FROM sale_order_recommendation_history
+                WHERE company_id = %(company_id)s
+                    AND {partner_field} IN %(partner_ids)s
+                    AND date >= %(month_start)s
+                UNION ALL
+                SELECT sol.product_id, count(*), sum(sol.qty_delivered)
+                FROM sale_order_line sol
+                JOIN sale_order so ON so.id = sol.order_id
+                WHERE {line_where}
+                    AND so.company_id = %(company_id)s
+                    AND COALESCE(so.{partner_field}, so.partner_id)
+                        IN %(partner_ids)s
+                    AND so.date_order >= %(start)s
+                    AND so.date_order < %(month_start)s
+                GROUP BY sol.product_id
+                UNION ALL
+                SELECT sol.product_id, -count(*), -sum(sol.qty_delivered)
+                FROM sale_order_line sol
+                JOIN sale_order so ON so.id = sol.order_id
+                WHERE {line_where}
+                    AND so.id = %(order_id)s
+                    AND so.date_order >= %(start)s
+                GROUP BY sol.product_id
             )
+            SELECT pp.id, sum(delivered.times)::integer,
+                sum(delivered.units)::float
+            FROM delivered
+            JOIN product_product pp ON pp.id = delivered.product_id
+            JOIN product_template pt ON pt.id = pp.product_tmpl_id
+            WHERE pp.active AND pt.sale_ok AND {product_where}
+            GROUP BY pp.id, pt.priority, pp.default_code
+            HAVING sum(delivered.times) > 0
+            ORDER BY 2 DESC, 3 DESC, pt.priority DESC, pp.default_code, pp.id
+            {limit}
+            """.format(
+                partner_field=partner_field,
+                line_where=line_where,
+                product_where=product_where,
+                limit="LIMIT %(limit)s" if limit else "",
+            ),
+            {
+                "company_id": self.order_id.company_id.id,
+                "partner_ids": tuple(partner_ids),
+                "start": start,
+                "month_start": month_start,
+                "order_id": self.order_id.id,
+                "product_ids": tuple(product_ids or [0]),
+                "limit": limit,
+            },
         )
-        # Manual ordering that circumvents ORM limitations
-        found_lines = sorted(
-            found_lines,
-            key=lambda res: (res["product_id_count"], res["qty_delivered"]),
-            reverse=True,
+        base_domain = [
+            ("order_id.company_id", "=", self.order_id.company_id.id),
+            ("order_id.%s" % partner_field, "child_of", partner.id),
+            ("order_id.date_order", ">=", fields.Datetime.to_string(start)),
+            ("order_id", "!=", self.order_id.id),
+            ("qty_delivered", "!=", 0.0),
+        ]
+        return [
+            {
+                "product_id": (product_id, False),
+                "product_id_count": times,
+                "qty_delivered": units,
+                "__domain": base_domain + [("product_id", "=", product_id)],
+            }
+            for product_id, times, units in self.env.cr.fetchall()
+        ]
+
+    def _find_recommendable_products(self):
+        """Return the delivered products of the period, best matches first.
+
+        The recommendation history is used unless an extra domain is configured,
+        as it can only be applied on the sales order lines.
+        """
+        if self._extended_recommendable_sale_order_lines_domain():
+            # Search with sudo for get sale order from other commercials users
+            found_lines = (
+                self.env["sale.order.line"]
+                .sudo()
+                .read_group(
+                    self._recommendable_sale_order_lines_domain(),
+                    ["product_id", "qty_delivered"],
+                    ["product_id"],
+                )
+            )
+            # Manual ordering that circumvents ORM limitations
+            return sorted(
+                found_lines,
+                key=lambda res: (res["product_id_count"], res["qty_delivered"]),
+                reverse=True,
+            )
+        order_product_ids = set(self.order_id.order_line.product_id.ids)
+        found_lines = self._read_recommendation_history(
+            limit=self.line_amount + len(order_product_ids)
         )
+        # The products of the order are always recommended, even if they are
+        # not among the best matches
+        missing_product_ids = order_product_ids - {
+            line["product_id"][0] for line in found_lines
+        }
+        if missing_product_ids:
+            found_lines += self._read_recommendation_history(
+                product_ids=list(missing_product_ids)
+            )
+        return found_lines
+
+    def generate_recommendations(self):
+        """Generate lines according to context sale order."""
+        # Search delivered products in previous months
+        found_lines = self._find_recommendable_products()
         found_dict = {product["product_id"][0]: product for product in found_lines}
         recommendation_lines = self.env["sale.order.recommendation.line"]
         existing_product_ids = set()
@@ -304,11 +435,16 @@ class SaleOrderRecommendationLine(models.TransientModel):
         price_origin = (
             fields.first(self).wizard_id.sale_recommendation_price_origin or "pricelist"
         )
-        for line in self:
+        for _wizard, lines in groupby(self, key=lambda line: line.wizard_id):
+            lines = self.browse().concat(*lines)
             if price_origin == "pricelist":
-                line.price_unit = line._get_unit_price_from_pricelist()
+                prices = lines._get_unit_prices_from_pricelist()
+                for line in lines:
+                    line.price_unit = prices[line]
             else:
-                line.price_unit = line._get_last_sale_price_product()
+                prices = lines._get_last_sale_prices()
+                for line in lines:
+                    line.price_unit = prices.get(line.product_id.id, 0.0)
 
     def _prepare_update_so_line_vals(self):
         vals = {"product_uom_qty": self.units_included}
@@ -329,61 +465,70 @@ class SaleOrderRecommendationLine(models.TransientModel):
             vals["price_unit"] = self.price_unit
         return vals
 
+    def _get_last_sale_prices(self):
+        """
+        Get last prices from last orders of the lines products, which must
+        belong to the same wizard.
+        Use sudo to read sale order from other users like as other commercials.
+        """
+        order = self.wizard_id.order_id
+        return (
+            self.env["sale.order.line"]
+            .sudo()
+            ._get_last_sale_prices(order.company_id, order.partner_id, self.product_id)
+        )
+
     def _get_last_sale_price_product(self):
         """
         Get last price from last order.
         Use sudo to read sale order from other users like as other commercials.
         """
         self.ensure_one()
-        so = (
-            self.env["sale.order"]
-            .sudo()
-            .search(
-                [
-                    ("company_id", "=", self.wizard_id.order_id.company_id.id),
-                    ("partner_id", "=", self.partner_id.id),
-                    ("date_order", "!=", False),
-                    ("state", "not in", ("draft", "sent", "cancel")),
-                    ("order_line.product_id", "=", self.product_id.id),
-                ],
-                limit=1,
-                order="date_order DESC, id DESC",
-            )
-        )
-        so_line = (
-            self.env["sale.order.line"]
-            .sudo()
-            .search(
-                [("order_id", "=", so.id), ("product_id", "=", self.product_id.id)],
-                limit=1,
-                order="id DESC",
+        return self._get_last_sale_prices().get(self.product_id.id, 0.0)
+
+    def _get_unit_prices_from_pricelist(self):
+        """
+        Get the pricelist prices of the lines, which must belong to the same
+        wizard. The pricelist rules are computed once for all the products
+        sharing the same quantity and unit of measure.
+        @return: Dictionary of tax included prices by line
+        """
+        order = self.wizard_id.order_id
+        pricelist = order.pricelist_id
+        # Prefetch the taxes of all the products at once
+        self.product_id.mapped("taxes_id")
+        prices = {}
+        for (quantity, uom, currency), lines in groupby(
+            self,
+            key=lambda line: (
+                line.units_included or 1.0,
+                # The product unit of measure is used by default
+                line.sale_uom_id
+                if line.sale_uom_id != line.product_id.uom_id
+                else self.env["uom.uom"],
+                line.currency_id,
+            ),
+        ):
+            lines = self.browse().concat(*lines)
+            rule_prices = pricelist._compute_price_rule(
+                lines.product_id,
+                quantity,
+                currency=currency,
+                uom=uom or None,
+                date=order.date_order,
             )
-            .with_context(prefetch_fields=False)
-        )
-        return so_line.price_unit or 0.0
+            for line in lines:
+                prices[line] = line.product_id._get_tax_included_unit_price(
+                    order.company_id,
+                    currency,
+                    order.date_order,
+                    "sale",
+                    fiscal_position=order.fiscal_position_id,
+                    product_price_unit=rule_prices[line.product_id.id][0],
+                    product_currency=currency,
+                )
+        return prices
 
     def _get_unit_price_from_pricelist(self):
-        pricelist_rule_id = self.pricelist_id._get_product_rule(
-            self.product_id,
-            self.units_included or 1.0,
-            uom=self.sale_uom_id or self.product_id.uom_id,
-            date=self.wizard_id.order_id.date_order,
-        )
-        pricelist_rule = self.env["product.pricelist.item"].browse(pricelist_rule_id)
-        price_rule = pricelist_rule._compute_price(
-            self.product_id,
-            self.units_included,
-            self.sale_uom_id or self.product_id.uom_id,
-            self.wizard_id.order_id.date_order,
-            currency=self.currency_id,
-        )
-        price_unit = self.product_id._get_tax_included_unit_price(
-            self.wizard_id.order_id.company_id,
-            self.currency_id,
-            self.wizard_id.order_id.date_order,
-            "sale",
-            fiscal_position=self.wizard_id.order_id.fiscal_position_id,
-            product_price_unit=price_rule,
-            product_currency=self.currency_id,
-        )
-        return price_unit
+        self.ensure_one()
+        return self._get_unit_prices_from_pricelist()[self]
@@ -1,2 +1,3 @@
 from . import product_packaging
+from . import product_product
 from . import sale_order_line
@@ -0,0 +1,16 @@
+# Copyright 2023 Moduon Team S.L.
+# License LGPL-3.0 or later (https://www.gnu.org/licenses/lgpl-3.0)
+from odoo import models
+
+
+class ProductProduct(models.Model):
+    _inherit = "product.product"
+
+    def _get_default_sale_packaging(self):
+        """Get the first packaging for sales of the product.
+
+        Read the packagings of all the products of a recordset before calling
+        it on each of them to avoid a query per product.
+        """
+        self.ensure_one()
+        return self.packaging_ids.filtered("sales")[:1]
@@ -2,7 +2,7 @@
 # License LGPL-3.0 or later (https://www.gnu.org/licenses/lgpl-3.0)
 from contextlib import suppress
 
-from odoo import api, fields, models
+from odoo import api, models
 
 
 class SaleOrderLine(models.Model):
@@ -22,6 +22,8 @@ class SaleOrderLine(models.Model):
     @api.depends("product_id", "product_uom_qty", "product_uom")
     def _compute_product_packaging_id(self):
         """Set a default packaging for sales if possible."""
+        # Read the packagings of all the products at once
+        self.product_id.packaging_ids.mapped("sales")
         for line in self:
             if line.product_id != line.product_packaging_id.product_id:
                 line.product_packaging_id = line._get_default_packaging(line.product_id)
@@ -47,9 +49,9 @@ class SaleOrderLine(models.Model):
 
     @api.model
     def _get_default_packaging(self, product):
-        return fields.first(
-            product.packaging_ids.filtered_domain([("sales", "=", True)])
-        )
+        if not product:
+            return self.env["product.packaging"]
+        return product._get_default_sale_packaging()
 
     @api.depends("product_packaging_id", "product_uom", "product_uom_qty")
     def _compute_product_packaging_qty(self):
@@ -126,3 +126,13 @@ class SalePackagingDefaultCase(ProductCommon):
             self.assertEqual(line_f.product_packaging_id, self.p2_three_pack)
             self.assertEqual(line_f.product_packaging_qty, 10)
             self.assertEqual(line_f.product_uom_qty, 30)
+
+    def test_default_sale_packaging(self):
+        """The default packaging follows the changes of the packagings."""
+        self.assertEqual(self.product._get_default_sale_packaging(), self.big_box)
+        self.big_box.sequence = 30
+        self.assertEqual(self.product._get_default_sale_packaging(), self.dozen)
+        self.dozen.sales = False
+        self.assertEqual(self.product._get_default_sale_packaging(), self.big_box)
+        self.big_box.unlink()
+        self.assertFalse(self.product._get_default_sale_packaging())
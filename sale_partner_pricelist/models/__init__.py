@@ -3,5 +3,6 @@
 
 from . import res_company
 from . import res_config_settings
+from . import product_pricelist
 from . import res_partner
 from . import sale_order
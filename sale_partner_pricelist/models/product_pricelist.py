@@ -0,0 +1,52 @@
+# Copyright 2023 Jarsa
+# License LGPL-3.0 or later (https://www.gnu.org/licenses/lgpl).
+
+from odoo import api, models
+
+ALL_PRICELISTS = "sale_partner_pricelist.all_pricelist_ids"
+
+
+class ProductPricelist(models.Model):
+    _inherit = "product.pricelist"
+
+    @api.model
+    def _get_all_pricelists(self):
+        """Get all the pricelists of the current companies.
+
+        They are kept in the transaction until a pricelist is created,
+        archived, moved to another company or deleted.
+        """
+        cache = self.env.cr.precommit.data.setdefault(ALL_PRICELISTS, {})
+        company_ids = tuple(sorted(self.env.companies.ids))
+        if company_ids not in cache:
+            cache[company_ids] = tuple(
+                self.sudo()
+                .search([("company_id", "in", list(company_ids) + [False])])
+                .ids
+            )
+        return self.browse(cache[company_ids])
+
+    @api.model
+    def _invalidate_all_pricelists_cache(self):
+        self.env.cr.precommit.data.pop(ALL_PRICELISTS, None)
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super().create(vals_list)
+        self._invalidate_all_pricelists_cache()
+        return records
+
+    def write(self, vals):
+        res = super().write(vals)
+        if {"active", "company_id"} & set(vals):
+            self._invalidate_all_pricelists_cache()
+        if "active" in vals:
+            # Archived pricelists are not read among the allowed ones
+            self.env["res.partner"]._invalidate_allowed_pricelists_cache()
+        return res
+
+    def unlink(self):
+        res = super().unlink()
+        self._invalidate_all_pricelists_cache()
+        self.env["res.partner"]._invalidate_allowed_pricelists_cache()
+        return res
@@ -5,6 +5,8 @@
 from odoo import _, api, fields, models
 from odoo.exceptions import ValidationError
 
+ALLOWED_PRICELISTS = "sale_partner_pricelist.allowed_pricelist_ids"
+
 
 class ResPartner(models.Model):
     _inherit = "res.partner"
@@ -18,15 +20,64 @@ class ResPartner(models.Model):
         "the sale order.",
     )
 
+    def _get_allowed_pricelists(self):
+        """Get the allowed pricelists of the commercial partner.
+
+        They are read with the access rights of the user and restricted to the
+        current companies. They are kept in the transaction per user, current
+        companies and commercial partner until the allowed pricelists of the
+        partner change or a pricelist is archived or deleted.
+        """
+        self.ensure_one()
+        commercial_partner = self.commercial_partner_id
+        if not commercial_partner.id:
+            # Records being edited are not cached
+            return commercial_partner.allowed_pricelist_ids
+        cache = self.env.cr.precommit.data.setdefault(ALLOWED_PRICELISTS, {})
+        key = (
+            self.env.uid,
+            tuple(sorted(self.env.companies.ids)),
+            commercial_partner.id,
+        )
+        if key not in cache:
+            company_ids = self.env.companies.ids + [False]
+            cache[key] = tuple(
+                commercial_partner.allowed_pricelist_ids.filtered(
+                    lambda pricelist: pricelist.company_id.id in company_ids
+                ).ids
+            )
+        return self.env["product.pricelist"].browse(cache[key])
+
+    @api.model
+    def _invalidate_allowed_pricelists_cache(self, partner_ids=None):
+        """Drop the allowed pricelists of the given partners, or all of them"""
+        cache = self.env.cr.precommit.data.get(ALLOWED_PRICELISTS)
+        if not cache:
+            return
+        if partner_ids is None:
+            cache.clear()
+            return
+        partner_ids = set(partner_ids)
+        for key in [key for key in cache if key[2] in partner_ids]:
+            del cache[key]
+
+    def write(self, vals):
+        res = super().write(vals)
+        if "allowed_pricelist_ids" in vals:
+            self._invalidate_allowed_pricelists_cache(self.ids)
+        return res
+
     @api.constrains("property_product_pricelist", "allowed_pricelist_ids")
     def _check_allowed_pricelist(self):
-        for partner in self:
+        if not self.env.company.use_partner_pricelist:
+            return
+        for partner in self.commercial_partner_id:
+            # Checked during the write, before the cache is invalidated
+            allowed_pricelists = partner.allowed_pricelist_ids
             if (
-                self.env.company.use_partner_pricelist
-                and partner.commercial_partner_id.allowed_pricelist_ids
-                and partner.commercial_partner_id.property_product_pricelist
-                and partner.commercial_partner_id.property_product_pricelist
-                not in partner.commercial_partner_id.allowed_pricelist_ids
+                allowed_pricelists
+                and partner.property_product_pricelist
+                and partner.property_product_pricelist not in allowed_pricelists
             ):
                 raise ValidationError(
                     _(
@@ -17,26 +17,22 @@ class SaleOrder(models.Model):
 
     @api.depends("partner_id")
     def _compute_partner_allowed_pricelist_ids(self):
+        all_pricelists = None
         for rec in self:
-            if (
-                rec.partner_id
-                and rec.partner_id.commercial_partner_id.allowed_pricelist_ids
-            ):
-                rec.partner_allowed_pricelist_ids = (
-                    rec.partner_id.commercial_partner_id.allowed_pricelist_ids
-                )
+            allowed_pricelists = (
+                rec.partner_id and rec.partner_id._get_allowed_pricelists()
+            )
+            if allowed_pricelists:
+                rec.partner_allowed_pricelist_ids = allowed_pricelists
             else:
-                rec.partner_allowed_pricelist_ids = self.env[
-                    "product.pricelist"
-                ].search([])
+                if all_pricelists is None:
+                    all_pricelists = self.env["product.pricelist"]._get_all_pricelists()
+                rec.partner_allowed_pricelist_ids = all_pricelists
 
     @api.constrains("pricelist_id")
     def _check_allowed_pricelist(self):
-        for rec in self:
-            if (
-                self.company_id.use_partner_pricelist
-                and rec.pricelist_id not in rec.partner_allowed_pricelist_ids
-            ):
+        for rec in self.filtered("company_id.use_partner_pricelist"):
+            if rec.pricelist_id not in rec.partner_allowed_pricelist_ids:
                 raise ValidationError(
                     _("The selected Pricelist is not allowed for this Partner.")
                 )
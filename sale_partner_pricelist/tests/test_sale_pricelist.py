@@ -46,3 +46,68 @@ class TestResPartner(TransactionCase):
             ValidationError, "The selected Pricelist is not allowed for this Partner."
         ):
             order.save()
+
+    def test_03_allowed_pricelists_cache(self):
+        partner_2 = self.env["res.partner"].create({"name": "No restriction"})
+        self.assertEqual(
+            partner_2._get_allowed_pricelists(), self.env["product.pricelist"]
+        )
+        order = self.env["sale.order"].new({"partner_id": partner_2.id})
+        self.assertIn(self.pricelist_2, order.partner_allowed_pricelist_ids)
+        # A new pricelist invalidates the cache of all the pricelists
+        pricelist_3 = self.env["product.pricelist"].create({"name": "Pricelist 3"})
+        order = self.env["sale.order"].new({"partner_id": partner_2.id})
+        self.assertIn(pricelist_3, order.partner_allowed_pricelist_ids)
+        # Changing the allowed pricelists invalidates the partner cache
+        contact = self.env["res.partner"].create(
+            {"name": "Contact", "parent_id": self.partner.id}
+        )
+        self.assertEqual(contact._get_allowed_pricelists(), self.pricelist_1)
+        self.partner.allowed_pricelist_ids = [(4, pricelist_3.id)]
+        self.assertEqual(
+            contact._get_allowed_pricelists(), self.pricelist_1 | pricelist_3
+        )
+        order = self.env["sale.order"].new({"partner_id": contact.id})
+        self.assertEqual(
+            order.partner_allowed_pricelist_ids, self.pricelist_1 | pricelist_3
+        )
+        # Archiving a pricelist invalidates both caches
+        pricelist_3.active = False
+        self.assertEqual(contact._get_allowed_pricelists(), self.pricelist_1)
+        self.assertNotIn(
+            pricelist_3, self.env["product.pricelist"]._get_all_pricelists()
+        )
+
+    def test_04_allowed_pricelists_multi_company(self):
+        company_a = self.env.company
+        company_b = self.env["res.company"].create(
+            {"name": "Company B", "use_partner_pricelist": True}
+        )
+        self.env.user.company_ids |= company_b
+        pricelist_a = self.env["product.pricelist"].create(
+            {"name": "Pricelist A", "company_id": company_a.id}
+        )
+        pricelist_b = self.env["product.pricelist"].create(
+            {"name": "Pricelist B", "company_id": company_b.id}
+        )
+        partner = self.env["res.partner"].create(
+            {"name": "Shared", "allowed_pricelist_ids": [(4, pricelist_a.id)]}
+        )
+        env_a = self.env(
+            context=dict(self.env.context, allowed_company_ids=company_a.ids)
+        )
+        env_b = self.env(
+            context=dict(self.env.context, allowed_company_ids=company_b.ids)
+        )
+        self.assertEqual(partner.with_env(env_a)._get_allowed_pricelists(), pricelist_a)
+        # The pricelists of company A do not restrict the partner in company B
+        self.assertFalse(partner.with_env(env_b)._get_allowed_pricelists())
+        order = env_b["sale.order"].create(
+            {
+                "partner_id": partner.id,
+                "company_id": company_b.id,
+                "pricelist_id": pricelist_b.id,
+            }
+        )
+        self.assertIn(pricelist_b, order.partner_allowed_pricelist_ids)
+        self.assertNotIn(pricelist_a, order.partner_allowed_pricelist_ids)
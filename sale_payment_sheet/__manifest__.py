@@ -6,7 +6,7 @@
     "name": "Sale payment sheet",
     "summary": "Allow to create invoice payments to commercial users without "
     "accounting permissions",
-    "version": "16.0.1.1.1",
+    "version": "16.0.1.3.0",
     "development_status": "Beta",
     "category": "Account",
     "website": "https://github.com/OCA/sale-workflow",
@@ -19,6 +19,7 @@
     "data": [
         "security/ir.model.access.csv",
         "security/security.xml",
+        "data/ir_cron.xml",
         "report/report_sale_payment_sheet_summary.xml",
         "report/sale_payment_sheet_report.xml",
         "views/res_users_views.xml",
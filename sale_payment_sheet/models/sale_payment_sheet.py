@@ -2,9 +2,15 @@
 # Copyright 2020 Tecnativa - Sergio Teruel
 # License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
 
+import logging
+import threading
+
 from odoo import _, api, fields, models
 from odoo.exceptions import UserError, ValidationError
 from odoo.tools import float_compare
+from odoo.tools.sql import create_index
+
+_logger = logging.getLogger(__name__)
 
 
 class SalePaymentSheet(models.Model):
@@ -83,6 +89,12 @@ class SalePaymentSheet(models.Model):
     group_lines = fields.Selection(
         selection=[("ref", "Reference")], string="Group statement lines by"
     )
+    confirm_requested = fields.Boolean(
+        string="Confirmation Scheduled",
+        readonly=True,
+        copy=False,
+        help="The sheet will be confirmed in background.",
+    )
 
     @api.depends("line_ids.amount")
     def _compute_amount_total(self):
@@ -127,52 +139,141 @@ class SalePaymentSheet(models.Model):
         else:
             return (line.id,)
 
-    def button_confirm_sheet(self):
-        sheets = self.filtered(lambda r: r.state == "open")
-        BankStatement = self.env["account.bank.statement"].sudo()
-        BankStatementLine = self.env["account.bank.statement.line"].sudo()
-        for sheet in sheets:
-            statement = BankStatement.create(
-                {
-                    "name": sheet.name,
-                    "date": sheet.date,
-                }
-            )
-            vals_dic = {}
-            for line in sheet.line_ids:
-                key = self._statement_line_key(line)
-
-                if line.invoice_id.move_type == "out_refund" and line.amount > 0.0:
-                    # convert to negative amounts if user pays a refund out
-                    # invoice with a positive amount.
-                    amount_line = -line.amount
-                else:
-                    amount_line = line.amount
-
-                if key not in vals_dic:
-                    vals_dic[key] = {
+    def _prepare_statement_vals(self):
+        self.ensure_one()
+        return {
+            "name": self.name,
+            "date": self.date,
+        }
+
+    def _prepare_statement_lines_vals(self, statement):
+        """Group the sheet lines into bank statement lines.
+
+        :return: list of (statement line vals, sale.payment.sheet.line)
+        """
+        self.ensure_one()
+        vals_dic = {}
+        for line in self.line_ids:
+            key = self._statement_line_key(line)
+
+            if line.invoice_id.move_type == "out_refund" and line.amount > 0.0:
+                # convert to negative amounts if user pays a refund out
+                # invoice with a positive amount.
+                amount_line = -line.amount
+            else:
+                amount_line = line.amount
+
+            if key not in vals_dic:
+                vals_dic[key] = (
+                    {
                         "date": line.date,
-                        "journal_id": sheet.journal_id.id,
-                        "invoice_user_id": sheet.user_id.id,
+                        "journal_id": self.journal_id.id,
+                        "invoice_user_id": self.user_id.id,
                         "amount": amount_line,
                         "partner_id": line.partner_id.id,
                         "payment_ref": line.ref or line.invoice_id.name,
                         "sequence": line.sequence,
                         "statement_id": statement.id,
-                        "payment_sheet_line_ids": line,
-                    }
-                else:
-                    vals_dic[key]["amount"] += amount_line
-                    vals_dic[key]["payment_sheet_line_ids"] += line
-            for vals in vals_dic.values():
-                payment_sheet_line_ids = vals.pop("payment_sheet_line_ids", None)
-                statement_line = BankStatementLine.create(vals)
-                payment_sheet_line_ids.statement_line_id = statement_line
+                    },
+                    [line],
+                )
+            else:
+                vals_dic[key][0]["amount"] += amount_line
+                vals_dic[key][1].append(line)
+        return [
+            (vals, self.env["sale.payment.sheet.line"].concat(*lines))
+            for vals, lines in vals_dic.values()
+        ]
+
+    @api.model
+    def _link_statement_lines(self, statement_lines, sheet_lines_list):
+        """Set the statement line of all the sheet lines with one query."""
+        sheet_line_ids = []
+        statement_line_ids = []
+        for statement_line, sheet_lines in zip(statement_lines, sheet_lines_list):
+            sheet_line_ids += sheet_lines.ids
+            statement_line_ids += [statement_line.id] * len(sheet_lines)
+        if not sheet_line_ids:
+            return
+        SheetLine = self.env["sale.payment.sheet.line"]
+        SheetLine.flush_model(["statement_line_id"])
+        self.env.cr.execute(
+            """
+            UPDATE sale_payment_sheet_line AS spsl
+            SET statement_line_id = v.statement_line_id,
+                write_uid = %s,
+                write_date = (now() at time zone 'UTC')
+            FROM unnest(%s::int[], %s::int[]) AS v(id, statement_line_id)
+            WHERE spsl.id = v.id
+            """,
+            (self.env.uid, sheet_line_ids, statement_line_ids),
+        )
+        SheetLine.invalidate_model(["statement_line_id", "write_uid", "write_date"])
+
+    def button_confirm_sheet(self):
+        sheets = self.filtered(lambda r: r.state == "open")
+        if not sheets:
+            return
+        BankStatement = self.env["account.bank.statement"].sudo()
+        BankStatementLine = self.env["account.bank.statement.line"].sudo()
+        statements = BankStatement.create(
+            [sheet._prepare_statement_vals() for sheet in sheets]
+        )
+        vals_list = []
+        sheet_lines_list = []
+        for sheet, statement in zip(sheets, statements):
+            for vals, sheet_lines in sheet._prepare_statement_lines_vals(statement):
+                vals_list.append(vals)
+                sheet_lines_list.append(sheet_lines)
+        statement_lines = BankStatementLine.create(vals_list)
+        self._link_statement_lines(statement_lines, sheet_lines_list)
+        for sheet, statement in zip(sheets, statements):
+            # Posted, not logged, to notify the followers subscribed to notes
             sheet.message_post(
                 body=_("Sheet %s confirmed, bank statement were created.")
                 % (statement.name,)
             )
-            sheet.write({"state": "confirm", "statement_id": statement.id})
+            sheet.write(
+                {
+                    "state": "confirm",
+                    "confirm_requested": False,
+                    "statement_id": statement.id,
+                }
+            )
+
+    def button_confirm_sheet_async(self):
+        """Confirm the sheets in background through a scheduled action."""
+        sheets = self.filtered(lambda r: r.state == "open" and not r.confirm_requested)
+        if not sheets:
+            return
+        sheets.confirm_requested = True
+        sheets._message_log_batch(
+            dict.fromkeys(sheets.ids, _("Sheet confirmation scheduled."))
+        )
+        self.env.ref(
+            "sale_payment_sheet.ir_cron_confirm_payment_sheets"
+        ).sudo()._trigger()
+
+    @api.model
+    def _cron_confirm_sheets(self, limit=None):
+        sheets = self.search(
+            [("state", "=", "open"), ("confirm_requested", "=", True)],
+            order="id",
+            limit=limit,
+        )
+        auto_commit = not getattr(threading.current_thread(), "testing", False)
+        total = len(sheets)
+        for index, sheet in enumerate(sheets, start=1):
+            try:
+                with self.env.cr.savepoint():
+                    sheet.button_confirm_sheet()
+            except Exception as error:
+                _logger.exception("Error confirming payment sheet %s", sheet.name)
+                sheet.confirm_requested = False
+                sheet.message_post(body=_("Sheet confirmation failed: %s") % (error,))
+            _logger.info("Payment sheet %s processed (%s/%s)", sheet.name, index, total)
+            if auto_commit:
+                self.env.cr.commit()  # pylint: disable=invalid-commit
 
     def button_reopen(self):
         self.ensure_one()
@@ -245,7 +346,9 @@ class SalePaymentSheetLine(models.Model):
         store=True,
         readonly=True,
     )
-    state = fields.Selection(related="sheet_id.state", string="Status", readonly=True)
+    state = fields.Selection(
+        related="sheet_id.state", string="Status", readonly=True, store=True
+    )
     invoice_id = fields.Many2one(
         comodel_name="account.move", string="Invoice", index=True
     )
@@ -300,6 +403,39 @@ class SalePaymentSheetLine(models.Model):
             if line.invoice_id.move_type == "out_refund" and line.amount > 0.0:
                 line.amount = -line.amount
 
+    def init(self):
+        # used by the over-payment check of the sheet lines
+        create_index(
+            self._cr,
+            "sale_payment_sheet_line_invoice_id_state_index",
+            self._table,
+            ["invoice_id", "state"],
+        )
+
+    def _get_open_amounts_by_invoice(self):
+        """Sum the amounts of the lines of open sheets for the invoices of
+        the lines, with a single grouped query.
+
+        :return: dict {invoice_id: (amount_payed, sheet_ids)}
+        """
+        invoice_ids = list(set(self.invoice_id.ids))
+        if not invoice_ids:
+            return {}
+        self.flush_model(["invoice_id", "amount", "sheet_id", "state"])
+        self.env.cr.execute(
+            """
+            SELECT invoice_id, SUM(amount), ARRAY_AGG(DISTINCT sheet_id)
+            FROM sale_payment_sheet_line
+            WHERE invoice_id = ANY(%s) AND state = 'open'
+            GROUP BY invoice_id
+            """,
+            (invoice_ids,),
+        )
+        return {
+            invoice_id: (amount_payed or 0.0, sheet_ids)
+            for invoice_id, amount_payed, sheet_ids in self.env.cr.fetchall()
+        }
+
     @api.constrains("invoice_id", "amount")
     def _check_invoice(self):
         for line in self:
@@ -308,19 +444,15 @@ class SalePaymentSheetLine(models.Model):
                 raise ValidationError(
                     _("The amount of a cash transaction cannot be 0.")
                 )
-            # Do not allow to enter a invoice totally payed more than one time
-            payment_lines = self.search(
-                [
-                    ("invoice_id", "=", line.invoice_id.id),
-                    ("sheet_id.state", "=", "open"),
-                ]
-            )
-            amount_payed = sum(payment_lines.mapped("amount"))
+        # Do not allow to enter a invoice totally payed more than one time
+        open_amounts = self._get_open_amounts_by_invoice()
+        for invoice in self.invoice_id:
+            amount_payed, sheet_ids = open_amounts.get(invoice.id, (0.0, []))
             if (
                 float_compare(
                     amount_payed,
-                    line.invoice_id.amount_residual,
-                    precision_rounding=line.invoice_id.currency_id.rounding,
+                    invoice.amount_residual,
+                    precision_rounding=invoice.currency_id.rounding,
                 )
                 == 1
             ):
@@ -333,9 +465,11 @@ class SalePaymentSheetLine(models.Model):
                         " %(payment_lines_name)s"
                     )
                     % {
-                        "invoice_name": line.invoice_id.name,
+                        "invoice_name": invoice.name,
                         "amount_payed": amount_payed,
-                        "payment_lines_name": payment_lines.mapped("sheet_id.name"),
+                        "payment_lines_name": self.env["sale.payment.sheet"]
+                        .browse(sheet_ids)
+                        .mapped("name"),
                     }
                 )
 
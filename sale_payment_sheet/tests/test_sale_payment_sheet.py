@@ -154,6 +154,51 @@ class TestSaleInvoicePayment(TransactionCase):
         self.assertTrue(sheet.statement_id)
         self.assertEqual(len(sheet.line_ids.mapped("statement_line_id")), 2)
 
+    def test_payment_sheet_confirm_multi(self):
+        sheet1 = self._create_payment_sheet()
+        sheet1.group_lines = "ref"
+        sheet2 = self.SalePaymentSheet.create(
+            {
+                "journal_id": self.bank_journal.id,
+                "line_ids": [
+                    (
+                        0,
+                        0,
+                        {
+                            "partner_id": self.partner.id,
+                            "invoice_id": self.invoice2.id,
+                            "amount": 25.0,
+                        },
+                    ),
+                    (
+                        0,
+                        0,
+                        {"partner_id": self.partner.id, "invoice_id": self.refund1.id},
+                    ),
+                ],
+            }
+        )
+        (sheet1 + sheet2).button_confirm_sheet()
+        self.assertEqual((sheet1 + sheet2).mapped("state"), ["confirm", "confirm"])
+        self.assertNotEqual(sheet1.statement_id, sheet2.statement_id)
+        # Grouped by partner and reference
+        self.assertEqual(len(sheet1.statement_id.line_ids), 1)
+        self.assertEqual(sheet1.line_ids.statement_line_id.amount, 150.0)
+        self.assertEqual(len(sheet2.statement_id.line_ids), 2)
+        for line in sheet2.line_ids:
+            self.assertEqual(line.statement_line_id.amount, line.amount)
+            self.assertEqual(line.statement_line_id.statement_id, sheet2.statement_id)
+
+    def test_payment_sheet_confirm_async(self):
+        sheet = self._create_payment_sheet()
+        sheet.button_confirm_sheet_async()
+        self.assertTrue(sheet.confirm_requested)
+        self.assertEqual(sheet.state, "open")
+        self.SalePaymentSheet._cron_confirm_sheets()
+        self.assertFalse(sheet.confirm_requested)
+        self.assertEqual(sheet.state, "confirm")
+        self.assertEqual(len(sheet.line_ids.mapped("statement_line_id")), 2)
+
     def test_payment_sheet_reopen(self):
         sheet = self._create_payment_sheet()
         sheet.button_confirm_sheet()
@@ -185,3 +230,36 @@ class TestSaleInvoicePayment(TransactionCase):
                     line_sheet.partner_id = self.partner
                     line_sheet.invoice_id = self.invoice1
             sheet_form.save()
+
+    def test_payment_sheet_invoice_constraint_bulk(self):
+        line_vals = {"partner_id": self.partner.id, "invoice_id": self.invoice2.id}
+        # Both lines together pay more than the invoice residual
+        with self.assertRaises(ValidationError):
+            self.SalePaymentSheet.create(
+                {
+                    "journal_id": self.bank_journal.id,
+                    "line_ids": [
+                        (0, 0, dict(line_vals, amount=60.0)),
+                        (0, 0, dict(line_vals, amount=60.0)),
+                    ],
+                }
+            )
+        sheet = self.SalePaymentSheet.create(
+            {
+                "journal_id": self.bank_journal.id,
+                "line_ids": [
+                    (0, 0, dict(line_vals, amount=60.0)),
+                    (0, 0, dict(line_vals, amount=40.0)),
+                ],
+            }
+        )
+        self.assertEqual(sheet.line_ids.mapped("state"), ["open", "open"])
+        # Lines of confirmed sheets are not taken into account
+        sheet.button_confirm_sheet()
+        self.assertEqual(sheet.line_ids.mapped("state"), ["confirm", "confirm"])
+        self.SalePaymentSheet.create(
+            {
+                "journal_id": self.bank_journal.id,
+                "line_ids": [(0, 0, dict(line_vals, amount=100.0))],
+            }
+        )
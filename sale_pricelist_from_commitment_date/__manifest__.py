@@ -3,11 +3,12 @@
 {
     "name": "Sale Pricelist From Commitment Date",
     "summary": "Use sale order commitment date to compute line price from pricelist",
-    "version": "16.0.1.0.0",
+    "version": "16.0.1.1.0",
     "category": "Sale",
     "website": "https://github.com/OCA/sale-workflow",
     "author": "Camptocamp, Odoo Community Association (OCA)",
     "license": "AGPL-3",
     "depends": ["sale"],
+    "data": ["views/sale_order_views.xml"],
     "installable": True,
 }
@@ -2,4 +2,5 @@
 
 from . import product_pricelist
 from . import product_pricelist_item
+from . import sale_order
 from . import sale_order_line
@@ -0,0 +1,31 @@
+# Copyright 2021 Camptocamp SA
+# License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl).
+
+from odoo import models
+from odoo.tools import groupby
+
+
+class SaleOrder(models.Model):
+
+    _inherit = "sale.order"
+
+    def _reprice_at_date(self, date):
+        """Recompute the prices of the order lines from the pricelist rules
+        applicable at the given date, resolving the rules of all the lines
+        in one pass.
+        """
+        lines = self.order_line.filtered(lambda line: not line.display_type)
+        if not lines:
+            return
+        lines = lines.with_context(force_pricelist_date=date)
+        lines._resolve_pricelist_items_at_date(date)
+        lines._compute_price_unit()
+        lines._compute_discount()
+
+    def action_reprice_at_commitment_date(self):
+        orders = self.filtered(lambda order: order.state in ("draft", "sent"))
+        for date, orders in groupby(
+            orders, key=lambda order: order.commitment_date or order.date_order
+        ):
+            self.browse().concat(*orders)._reprice_at_date(date)
+        return True
@@ -2,32 +2,67 @@
 # License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl).
 
 from odoo import api, models
+from odoo.tools import groupby
 
 
 class SaleOrderLine(models.Model):
 
     _inherit = "sale.order.line"
 
+    def _group_by_pricelist_date(self):
+        """Group the lines by the date used to compute their price.
+
+        :return: list of (date, sale.order.line)
+        """
+        if "force_pricelist_date" in self.env.context:
+            return [(self.env.context["force_pricelist_date"], self)]
+        return [
+            (date, self.browse().concat(*lines))
+            for date, lines in groupby(
+                self, key=lambda line: line.order_id.commitment_date
+            )
+        ]
+
     @api.depends(
         "product_id", "product_uom", "product_uom_qty", "order_id.commitment_date"
     )
     def _compute_price_unit(self):
-        for line in self:
-            date = self.env.context.get(
-                "force_pricelist_date", line.order_id.commitment_date
-            )
-            line = line.with_context(force_pricelist_date=date)
-            super(SaleOrderLine, line)._compute_price_unit()
+        for date, lines in self._group_by_pricelist_date():
+            lines = lines.with_context(force_pricelist_date=date)
+            super(SaleOrderLine, lines)._compute_price_unit()
         return True
 
     @api.depends(
         "product_id", "product_uom", "product_uom_qty", "order_id.commitment_date"
     )
     def _compute_pricelist_item_id(self):
-        for line in self:
-            date = self.env.context.get(
-                "force_pricelist_date", line.order_id.commitment_date
-            )
-            line = line.with_context(force_pricelist_date=date)
-            super(SaleOrderLine, line)._compute_pricelist_item_id()
+        for date, lines in self._group_by_pricelist_date():
+            lines = lines.with_context(force_pricelist_date=date)
+            super(SaleOrderLine, lines)._compute_pricelist_item_id()
         return True
+
+    def _resolve_pricelist_items_at_date(self, date):
+        """Set the pricelist rules of the lines applicable at the given date,
+        calling the pricelist rules engine once per pricelist, quantity and
+        unit of measure.
+        """
+        lines_to_resolve = self.filtered(
+            lambda line: line.product_id
+            and not line.display_type
+            and line.order_id.pricelist_id
+        )
+        (self - lines_to_resolve).pricelist_item_id = False
+        for (pricelist, uom, qty), lines in groupby(
+            lines_to_resolve,
+            key=lambda line: (
+                line.order_id.pricelist_id,
+                line.product_uom,
+                line.product_uom_qty or 1.0,
+            ),
+        ):
+            lines = self.browse().concat(*lines)
+            rules = pricelist._compute_price_rule(
+                lines.product_id, qty, uom=uom, date=date
+            )
+            for line in lines:
+                line.pricelist_item_id = rules[line.product_id.id][1]
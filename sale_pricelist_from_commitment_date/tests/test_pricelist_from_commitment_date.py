@@ -1,6 +1,7 @@
 # Copyright 2021 Camptocamp SA
 # License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl).
 
+from odoo import fields
 from odoo.tests import TransactionCase
 
 
@@ -146,3 +147,32 @@ class PricelistFromCommitmentDate(TransactionCase):
                 "order_line/price_unit": "300.00",
             }
         )
+
+    def test_03_reprice_at_date(self):
+        sale = self.sale
+        sale.pricelist_id = self.pricelist
+        order_line = sale.order_line[0]
+        product = order_line.product_id
+        self.assertEqual(order_line.price_unit, product.list_price)
+        sale._reprice_at_date(fields.Datetime.to_datetime("2020-03-12"))
+        self.assertEqual(order_line.price_unit, 20)
+        self.assertEqual(order_line.pricelist_item_id.fixed_price, 20)
+        # Lines of orders with different commitment dates
+        sale_2 = sale.copy({"commitment_date": "2020-03-17"})
+        sale_2.order_line.price_unit = 1
+        sale.commitment_date = "2020-03-08"
+        order_line.price_unit = 1
+        (sale | sale_2).action_reprice_at_commitment_date()
+        self.assertEqual(order_line.price_unit, 10)
+        self.assertEqual(sale_2.order_line[0].price_unit, 30)
+
+    def test_04_group_by_pricelist_date(self):
+        sale_2 = self.sale.copy({"commitment_date": "2020-03-17"})
+        lines = self.sale.order_line | sale_2.order_line
+        groups = dict(lines._group_by_pricelist_date())
+        self.assertEqual(groups[self.sale.commitment_date], self.sale.order_line)
+        self.assertEqual(groups[sale_2.commitment_date], sale_2.order_line)
+        groups = lines.with_context(
+            force_pricelist_date="2020-03-08"
+        )._group_by_pricelist_date()
+        self.assertEqual(groups, [("2020-03-08", lines)])
@@ -9,5 +9,4 @@ from odoo import SUPERUSER_ID, api
 def post_init_hook(cr, registry):
     with api.Environment.manage():
         env = api.Environment(cr, SUPERUSER_ID, {})
-        sales = env["sale.order"].search([])
-        sales._compute_oca_delivery_status()
+        env["sale.order"]._mass_recompute_oca_delivery_status()
@@ -6,6 +6,7 @@
 
 from odoo import _, api, fields, models
 from odoo.exceptions import ValidationError
+from odoo.tools import groupby
 
 
 class SaleOrderLine(models.Model):
@@ -39,26 +40,77 @@ class SaleOrderLine(models.Model):
             return self._multiplicative_discount()
         else:
             raise ValidationError(
-                _("Sale order line %(name)s has unknown discounting type %(dic_type)s")
+                _("Sale order line %(name)s has unknown discounting type %(disc_type)s")
                 % {"name": self.name, "disc_type": self.discounting_type}
             )
 
+    def _get_final_discounts(self):
+        """Compute the final discount of all the lines in one pass.
+
+        :returns: dictionary of final discount by line"""
+        final_discounts = {}
+        for discounting_type, lines in groupby(
+            self, key=lambda line: line.discounting_type
+        ):
+            lines = self.browse().concat(*lines)
+            if discounting_type == "additive":
+                final_discounts.update(lines._additive_discounts())
+            elif discounting_type == "multiplicative":
+                final_discounts.update(lines._multiplicative_discounts())
+            else:
+                raise ValidationError(
+                    _(
+                        "Sale order line %(name)s has unknown discounting type "
+                        "%(disc_type)s"
+                    )
+                    % {"name": lines[0].name, "disc_type": discounting_type}
+                )
+        return final_discounts
+
+    def _get_discount_values(self):
+        """Read the discounts of all the lines, field by field.
+
+        :returns: list of (line, list of discounts) tuples"""
+        columns = [self.mapped(fname) for fname in self._discount_fields()]
+        return [
+            (line, [discount or 0.0 for discount in discounts])
+            for line, *discounts in zip(self, *columns)
+        ]
+
+    @api.model
+    def _combine_additive_discounts(self, discounts):
+        return min(max(sum(discounts), 0), 100)
+
+    @api.model
+    def _combine_multiplicative_discounts(self, discounts):
+        final_discount = 1
+        for discount in discounts:
+            final_discount *= 1 - discount / 100
+        return 100 - final_discount * 100
+
     def _additive_discount(self):
         self.ensure_one()
-        discount = sum(self[x] or 0.0 for x in self._discount_fields())
-        if discount <= 0:
-            return 0
-        elif discount >= 100:
-            return 100
-        return discount
+        return self._combine_additive_discounts(
+            [self[fname] or 0.0 for fname in self._discount_fields()]
+        )
+
+    def _additive_discounts(self):
+        return {
+            line: self._combine_additive_discounts(discounts)
+            for line, discounts in self._get_discount_values()
+        }
 
     def _multiplicative_discount(self):
         self.ensure_one()
-        discounts = [1 - (self[x] or 0.0) / 100 for x in self._discount_fields()]
-        final_discount = 1
-        for discount in discounts:
-            final_discount *= discount
-        return 100 - final_discount * 100
+        return self._combine_multiplicative_discounts(
+            [self[fname] or 0.0 for fname in self._discount_fields()]
+        )
+
+    def _multiplicative_discounts(self):
+        return {
+            line: self._combine_multiplicative_discounts(discounts)
+            for line, discounts in self._get_discount_values()
+        }
 
     @api.model
     def _discount_fields(self):
@@ -66,10 +118,14 @@ class SaleOrderLine(models.Model):
 
     @api.depends("discount2", "discount3", "discounting_type")
     def _compute_amount(self):
-        prev_values = self.triple_discount_preprocess()
-        res = super()._compute_amount()
-        self.triple_discount_postprocess(prev_values)
-        return res
+        # The final discounts of all the lines are computed at once, then given
+        # to the taxes computation by _convert_to_tax_base_line_dict. The
+        # discounts are left untouched.
+        final_discounts = {
+            line.id: discount for line, discount in self._get_final_discounts().items()
+        }
+        lines = self.with_context(triple_discount_final_discounts=final_discounts)
+        return super(SaleOrderLine, lines)._compute_amount()
 
     _sql_constraints = [
         (
@@ -96,13 +152,15 @@ class SaleOrderLine(models.Model):
     def triple_discount_preprocess(self):
         """Prepare data for post processing.
 
+        Not used anymore for the amounts computation, kept for compatibility.
+
         Save the values of the discounts in a dictionary,
         to be restored in postprocess.
         Resetting every discount except the main one to 0.0 avoids issues if
         this method is called multiple times.
         Updating the cache provides consistency through re-computations."""
         prev_values = dict()
-        self.invalidate_cache(fnames=self._discount_fields(), ids=self.ids)
+        self.invalidate_recordset(self._discount_fields())
         for line in self:
             prev_values[line] = {
                 fname: line[fname] for fname in self._discount_fields()
@@ -117,16 +175,20 @@ class SaleOrderLine(models.Model):
     @api.model
     def triple_discount_postprocess(self, prev_values):
         """Restore the discounts of the lines in the dictionary prev_values.
+        Not used anymore for the amounts computation, kept for compatibility.
         Updating the cache provides consistency through re-computations."""
-        self.invalidate_cache(
-            fnames=self._discount_fields(),
-            ids=[line.id for line in list(prev_values.keys())],
-        )
+        self.browse().concat(*prev_values).invalidate_recordset(self._discount_fields())
         for line, prev_vals_dict in list(prev_values.items()):
             line.update(prev_vals_dict)
 
     def _convert_to_tax_base_line_dict(self):
         self.ensure_one()
+        # the final discounts are given by _compute_amount for all its lines
+        final_discounts = self.env.context.get("triple_discount_final_discounts")
+        if final_discounts and self.id in final_discounts:
+            discount = final_discounts[self.id]
+        else:
+            discount = self._get_final_discount()
         return self.env["account.tax"]._convert_to_tax_base_line_dict(
             self,
             partner=self.order_id.partner_id,
@@ -135,6 +197,6 @@ class SaleOrderLine(models.Model):
             taxes=self.tax_id,
             price_unit=self.price_unit,
             quantity=self.product_uom_qty,
-            discount=self._get_final_discount(),
+            discount=discount,
             price_subtotal=self.price_subtotal,
         )
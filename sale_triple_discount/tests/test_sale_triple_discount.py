@@ -3,6 +3,7 @@
 # Copyright 2022 Manuel Regidor - Sygel Technology
 # License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl).
 
+from unittest import mock
 
 from odoo.tests import common
 
@@ -208,3 +209,36 @@ class TestSaleOrder(common.TransactionCase):
         self.assertAlmostEqual(self.so_line2.price_subtotal, 600.0)
         self.assertAlmostEqual(self.order.amount_untaxed, 1200.0)
         self.assertAlmostEqual(self.order.amount_tax, 180.0)
+
+    def test_07_final_discounts(self):
+        """Final discounts are computed for the whole recordset"""
+        self.so_line1.write({"discount": 20.0, "discount2": 20.0, "discount3": 20.0})
+        self.so_line2.write(
+            {
+                "discounting_type": "additive",
+                "discount": 20.0,
+                "discount2": 20.0,
+                "discount3": 20.0,
+            }
+        )
+        final_discounts = self.order.order_line._get_final_discounts()
+        self.assertAlmostEqual(final_discounts[self.so_line1], 48.8)
+        self.assertAlmostEqual(final_discounts[self.so_line2], 60.0)
+        self.assertAlmostEqual(self.so_line1.price_subtotal, 307.2)
+        self.assertAlmostEqual(self.so_line2.price_subtotal, 240.0)
+        # The discounts of the lines are not altered by the computation
+        self.assertEqual(self.so_line1.discount, 20.0)
+        self.assertEqual(self.so_line2.discount2, 20.0)
+
+    def test_08_final_discounts_batch(self):
+        """The amounts use the final discounts computed for all the lines"""
+        self.so_line1.discount2 = 20.0
+        self.so_line2.write({"discounting_type": "additive", "discount2": 20.0})
+        line_cls = type(self.env["sale.order.line"])
+        with mock.patch.object(
+            line_cls, "_get_final_discount", side_effect=AssertionError
+        ):
+            self.order.order_line.write({"discount3": 10.0})
+            self.order.order_line.flush_recordset()
+        self.assertAlmostEqual(self.so_line1.price_subtotal, 432.0)
+        self.assertAlmostEqual(self.so_line2.price_subtotal, 420.0)
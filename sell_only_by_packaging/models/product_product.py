@@ -1,9 +1,22 @@
 # Copyright 2020 Camptocamp SA
 # License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl.html).
 
+from collections import namedtuple
+
 from odoo import api, fields, models
 from odoo.tools import float_compare, float_round
 
+SellablePackagingIndex = namedtuple(
+    "SellablePackagingIndex",
+    [
+        "packaging_ids",
+        "qtys",
+        "default_packaging_id",
+        "min_sellable_qty",
+        "forced_qtys",
+    ],
+)
+
 
 class ProductProduct(models.Model):
     _inherit = "product.product"
@@ -15,6 +28,12 @@ class ProductProduct(models.Model):
             "if Only Sell by Packaging is set."
         ),
     )
+    sellable_packaging_ids = fields.Many2many(
+        comodel_name="product.packaging",
+        compute="_compute_sellable_packaging_ids",
+        compute_sudo=True,
+        help="Packagings of the product which can be sold in the current companies",
+    )
 
     @api.depends(
         "sell_only_by_packaging",
@@ -22,13 +41,66 @@ class ProductProduct(models.Model):
         "packaging_ids.sales",
     )
     def _compute_variant_min_sellable_qty(self):
+        indexes = self.filtered(
+            "sell_only_by_packaging"
+        )._get_sellable_packaging_indexes()
         for record in self:
             record.min_sellable_qty = 0.0
-            if record.sell_only_by_packaging and record.packaging_ids:
-                sellable_pkgs = record.packaging_ids.filtered(lambda p: p.sales)
-                record.min_sellable_qty = fields.first(
-                    sellable_pkgs.sorted(lambda p: p.qty)
-                ).qty
+            if record in indexes:
+                record.min_sellable_qty = indexes[record].min_sellable_qty
+
+    @api.depends(
+        "packaging_ids",
+        "packaging_ids.sales",
+        "packaging_ids.company_id",
+    )
+    @api.depends_context("allowed_company_ids")
+    def _compute_sellable_packaging_ids(self):
+        company_ids = self.env.companies.ids
+        for record in self:
+            record.sellable_packaging_ids = record.packaging_ids.filtered(
+                lambda p: p.sales
+                and (not p.company_id or p.company_id.id in company_ids)
+            )
+
+    def _get_sellable_packaging_indexes(self):
+        """
+        Get the sellable packagings index of all the products.
+        The sellable packagings of all the products are computed at once.
+        :return: dict of SellablePackagingIndex by product
+        """
+        # Compute the sellable packagings and read their values in one go
+        self.sellable_packaging_ids.mapped("qty")
+        return {product: product._get_sellable_packaging_index() for product in self}
+
+    def _get_sellable_packaging_index(self):
+        """
+        Get the sellable packagings of the product: their ids and quantities
+        sorted by quantity, the default one, the minimum sellable quantity and
+        the quantities of the packagings forcing the sale quantity.
+        It is built from the sellable packagings of the product, which the ORM
+        keeps in the record cache until the packagings change, and drops when
+        a savepoint or the transaction is rolled back.
+        :return: SellablePackagingIndex
+        """
+        self.ensure_one()
+        return self._prepare_sellable_packaging_index(self.sellable_packaging_ids)
+
+    @api.model
+    def _prepare_sellable_packaging_index(self, packagings):
+        packagings = packagings.filtered("sales")
+        packagings_by_qty = packagings.sorted(lambda p: p.qty)
+        return SellablePackagingIndex(
+            packaging_ids=tuple(packagings_by_qty.ids),
+            qtys=tuple(packagings_by_qty.mapped("qty")),
+            default_packaging_id=packagings[:1].id,
+            min_sellable_qty=packagings_by_qty[:1].qty,
+            forced_qtys={
+                packaging.id: packaging.qty
+                for packaging in packagings
+                if packaging.force_sale_qty
+            },
+        )
 
     def _convert_packaging_qty(self, qty, uom, packaging):
         """
@@ -45,16 +117,27 @@ class ProductProduct(models.Model):
             return qty
         self.ensure_one()
         if self.sell_only_by_packaging and packaging.force_sale_qty:
-            q = self.uom_id._compute_quantity(packaging.qty, uom)
-            if (
-                qty
-                and q
-                and float_compare(
-                    qty / q,
-                    float_round(qty / q, precision_rounding=1.0),
-                    precision_rounding=0.001,
-                )
-                != 0
-            ):
-                qty = qty - (qty % q) + q
+            qty = self._round_packaging_qty(qty, uom, packaging.qty)
+        return qty
+
+    def _round_packaging_qty(self, qty, uom, packaging_qty):
+        """
+        Round up the given qty with given UoM to a multiple of the packaging
+        quantity, expressed in the UoM of the product.
+        :param qty: float
+        :return: float
+        """
+        self.ensure_one()
+        q = self.uom_id._compute_quantity(packaging_qty, uom)
+        if (
+            qty
+            and q
+            and float_compare(
+                qty / q,
+                float_round(qty / q, precision_rounding=1.0),
+                precision_rounding=0.001,
+            )
+            != 0
+        ):
+            qty = qty - (qty % q) + q
         return qty
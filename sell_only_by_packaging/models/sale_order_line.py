@@ -14,11 +14,35 @@ class SaleOrderLine(models.Model):
         "product_id", "product_packaging_id", "product_packaging_qty", "product_uom_qty"
     )
     def _check_product_packaging_sell_only_by_packaging(self):
-        for line in self:
-            if not line.product_id.sell_only_by_packaging or not line.product_uom_qty:
-                continue
+        invalid_lines = self._get_sell_only_by_packaging_invalid_lines()
+        if invalid_lines:
+            raise ValidationError(
+                _(
+                    "Product %s can only be sold with a packaging and a "
+                    "packaging quantity."
+                )
+                % ", ".join(invalid_lines.product_id.mapped("name"))
+            )
+
+    def _get_sell_only_by_packaging_indexes(self):
+        """
+        Get the sellable packagings index of the products of the lines sold
+        only by packaging, read once for all the lines.
+        :return: dict of SellablePackagingIndex by product
+        """
+        products = self.product_id.filtered("sell_only_by_packaging")
+        return products._get_sellable_packaging_indexes()
 
-            if (
+    def _get_sell_only_by_packaging_invalid_lines(self):
+        """
+        Get the lines of products sold only by packaging which are missing a
+        packaging or a whole packaging quantity.
+        :return: sale.order.line recordset
+        """
+        return self.filtered(
+            lambda line: line.product_id.sell_only_by_packaging
+            and line.product_uom_qty
+            and (
                 not line.product_packaging_id
                 or float_compare(
                     line.product_packaging_qty,
@@ -26,14 +50,43 @@ class SaleOrderLine(models.Model):
                     precision_digits=2,
                 )
                 != 0
-            ):
-                raise ValidationError(
-                    _(
-                        "Product %s can only be sold with a packaging and a "
-                        "packaging quantity."
+            )
+        )
+
+    def _get_packaging_rounded_qties(self, indexes=None):
+        """
+        Get the quantities of the lines rounded up to a multiple of their
+        packaging, when the packaging forces the sale quantity.
+        :param indexes: sellable packagings indexes of the products, as
+          returned by _get_sell_only_by_packaging_indexes
+        :return: dict of quantity by line
+        """
+        if indexes is None:
+            indexes = self._get_sell_only_by_packaging_indexes()
+        rounded_qties = {}
+        for line in self:
+            qty = line.product_uom_qty
+            index = indexes.get(line.product_id)
+            packaging = line.product_packaging_id
+            if index is not None and packaging:
+                if packaging.id in index.forced_qtys:
+                    qty = line.product_id._round_packaging_qty(
+                        qty, line.product_uom, index.forced_qtys[packaging.id]
                     )
-                    % line.product_id.name
-                )
+                elif packaging.id not in index.packaging_ids:
+                    # Packagings which cannot be sold are not indexed
+                    qty = line.product_id._convert_packaging_qty(
+                        qty, line.product_uom, packaging=packaging
+                    )
+            rounded_qties[line] = qty
+        return rounded_qties
+
+    def _force_qty_with_packages(self):
+        """Round up the quantities of the lines to their packaging."""
+        for line, qty in self._get_packaging_rounded_qties().items():
+            if qty != line.product_uom_qty:
+                line.product_uom_qty = qty
+        return True
 
     def _force_qty_with_package(self):
         """
@@ -41,11 +94,7 @@ class SaleOrderLine(models.Model):
         :return:
         """
         self.ensure_one()
-        qty = self.product_id._convert_packaging_qty(
-            self.product_uom_qty, self.product_uom, packaging=self.product_packaging_id
-        )
-        self.product_uom_qty = qty
-        return True
+        return self._force_qty_with_packages()
 
     @api.onchange("product_uom_qty")
     def _onchange_product_uom_qty(self):
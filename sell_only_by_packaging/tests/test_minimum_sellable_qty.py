@@ -1,6 +1,7 @@
 # Copyright 2020 Camptocamp SA
 # License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl)
 
+from odoo.exceptions import UserError
 from odoo.tests import TransactionCase
 
 
@@ -56,3 +57,51 @@ class TestMinimumSellableQty(TransactionCase):
         )
         self.assertEqual(self.product.min_sellable_qty, 2)
         self.assertEqual(self.product.product_tmpl_id.min_sellable_qty, 2)
+
+    def test_sellable_packaging_index(self):
+        """Check the sellable packagings index follows the packagings."""
+        index = self.product._get_sellable_packaging_index()
+        self.assertEqual(index.packaging_ids, (self.packaging2.id, self.packaging1.id))
+        self.assertEqual(index.qtys, (3.0, 5.0))
+        self.assertEqual(index.default_packaging_id, self.packaging1.id)
+        self.assertEqual(index.min_sellable_qty, 3.0)
+        self.packaging1.qty = 2.0
+        index = self.product._get_sellable_packaging_index()
+        self.assertEqual(index.packaging_ids, (self.packaging1.id, self.packaging2.id))
+        self.assertEqual(index.min_sellable_qty, 2.0)
+        self.packaging1.unlink()
+        index = self.product._get_sellable_packaging_index()
+        self.assertEqual(index.packaging_ids, (self.packaging2.id,))
+        self.assertEqual(index.default_packaging_id, self.packaging2.id)
+
+    def test_sellable_packaging_index_invalidation(self):
+        """Check the sellable packagings index follows the packagings."""
+        index = self.product._get_sellable_packaging_index()
+        self.assertFalse(index.forced_qtys)
+        self.packaging1.name = "Box of five"
+        self.assertEqual(self.product._get_sellable_packaging_index(), index)
+        self.packaging1.force_sale_qty = True
+        index = self.product._get_sellable_packaging_index()
+        self.assertEqual(index.forced_qtys, {self.packaging1.id: 5.0})
+        self.packaging_level_2.can_be_sold = False
+        index = self.product._get_sellable_packaging_index()
+        self.assertEqual(index.packaging_ids, (self.packaging1.id,))
+
+    def test_sellable_packaging_index_savepoint_rollback(self):
+        """Check the packagings rolled back are dropped from the index."""
+        self.product._get_sellable_packaging_index()
+        with self.assertRaises(UserError):
+            with self.env.cr.savepoint():
+                packaging3 = self.env["product.packaging"].create(
+                    {
+                        "name": "Packing of 2",
+                        "product_id": self.product.id,
+                        "qty": 2.0,
+                        "packaging_level_id": self.packaging_level_3.id,
+                    }
+                )
+                index = self.product._get_sellable_packaging_index()
+                self.assertIn(packaging3.id, index.packaging_ids)
+                raise UserError("rollback")
+        index = self.product._get_sellable_packaging_index()
+        self.assertEqual(index.packaging_ids, (self.packaging2.id, self.packaging1.id))
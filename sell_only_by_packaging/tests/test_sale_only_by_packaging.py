@@ -103,3 +103,26 @@ class TestSaleProductByPackagingOnly(Common):
             self.assertAlmostEqual(
                 self.order_line.product_uom_qty, 18, places=self.precision
             )
+
+    def test_bulk_packaging_checks(self):
+        """Invalid lines are found and rounded on whole recordsets."""
+        self.order_line.product_uom_qty = 3.0
+        self.assertFalse(self.order_line._get_sell_only_by_packaging_invalid_lines())
+        self.product.sell_only_by_packaging = True
+        self.assertEqual(
+            self.order.order_line._get_sell_only_by_packaging_invalid_lines(),
+            self.order_line,
+        )
+        self.packaging_tu.force_sale_qty = True
+        new_line = self.env["sale.order.line"].new(
+            {
+                "order_id": self.order.id,
+                "product_id": self.product.id,
+                "product_uom": self.product.uom_id.id,
+                "product_packaging_id": self.packaging_tu.id,
+            }
+        )
+        new_line.product_uom_qty = 52
+        self.assertEqual(new_line._get_packaging_rounded_qties(), {new_line: 60})
+        new_line._force_qty_with_packages()
+        self.assertEqual(new_line.product_uom_qty, 60)
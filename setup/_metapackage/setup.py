@@ -22,6 +22,7 @@ setuptools.setup(
         'odoo-addon-sale_cancel_reason>=16.0dev,<16.1dev',
         'odoo-addon-sale_commercial_partner>=16.0dev,<16.1dev',
         'odoo-addon-sale_company_currency>=16.0dev,<16.1dev',
+        'odoo-addon-sale_currency_conversion_base>=16.0dev,<16.1dev',
         'odoo-addon-sale_delivery_split_date>=16.0dev,<16.1dev',
         'odoo-addon-sale_delivery_state>=16.0dev,<16.1dev',
         'odoo-addon-sale_discount_display_amount>=16.0dev,<16.1dev',
@@ -33,6 +34,7 @@ setuptools.setup(
         'odoo-addon-sale_invoice_frequency>=16.0dev,<16.1dev',
         'odoo-addon-sale_invoice_policy>=16.0dev,<16.1dev',
         'odoo-addon-sale_last_price_info>=16.0dev,<16.1dev',
+        'odoo-addon-sale_last_sale_price_base>=16.0dev,<16.1dev',
         'odoo-addon-sale_loyalty_exclude>=16.0dev,<16.1dev',
         'odoo-addon-sale_manual_delivery>=16.0dev,<16.1dev',
         'odoo-addon-sale_mrp_bom>=16.0dev,<16.1dev',